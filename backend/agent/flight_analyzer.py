@@ -1,20 +1,56 @@
 import logging
 import os
-import json
+import heapq
+import orjson
+import numpy as np
 import redis.asyncio as aioredis
 from typing import Dict, Any, Optional
 from mavlink_parser.parser import MAVLinkParser
+from mavlink_parser.columns import channel_length, channel_column, channel_values
 from llm.llm_client import LLMClient
+from storage import SUMMARY_NAMESPACE, redis_key
 from .util import format_flight_time
 
 logger = logging.getLogger(__name__)
 
+# Display names for the error severities shown in the critical issues summary
+SEVERITY_NAMES = {1: 'Emergency', 2: 'Critical', 3: 'Error', 4: 'Warning'}
+
+# Priority stats for LLM analysis: (stat key, label, unit, format spec)
+KEY_STATS = (
+    ('max_altitude', 'Max Altitude', 'm', '.1f'),
+    ('max_battery_voltage', 'Max Battery Voltage', 'V', '.2f'),
+    ('min_battery_voltage', 'Min Battery Voltage', 'V', '.2f'),
+    ('battery_voltage_drop', 'Battery Voltage Drop', 'V', '.2f'),
+    ('avg_current', 'Average Current', 'A', '.2f'),
+    ('max_current', 'Max Current', 'A', '.2f'),
+    ('total_current_consumed', 'Total Current Consumed', 'mAh', '.0f'),
+    ('avg_satellites', 'Average GPS Satellites', '', '.0f'),
+    ('min_satellites', 'Min GPS Satellites', '', '.0f'),
+    ('gps_loss_events', 'GPS Loss Events', '', '.0f'),
+    ('rc_loss_events', 'RC Loss Events', '', '.0f'),
+    ('max_roll', 'Max Roll Angle', '°', '.1f'),
+    ('max_pitch', 'Max Pitch Angle', '°', '.1f'),
+    ('max_cpu_load', 'Max CPU Load', '%', '.1f'),
+    ('avg_cpu_load', 'Average CPU Load', '%', '.1f')
+)
+
+# Most key statistics listed in the context
+MAX_KEY_STATS = 12
+
+# Most flight contexts kept in memory, one per chat session
+MAX_CACHED_CONTEXTS = 64
+
 class FlightAnalyzer:
     """Flight data analyzer with LLM-powered analysis capabilities"""
     
     def __init__(self):
         self.llm_client = LLMClient()
         self.redis_client = None
+        # session_id -> formatted flight context (parsed data is immutable per session)
+        self._context_cache: Dict[str, str] = {}
+        # prompt file -> template with includes resolved, read from disk once
+        self._prompt_cache: Dict[str, str] = {}
         # Import QueryHandler here to avoid circular imports
         from .query_handler import QueryHandler
         self.query_handler = QueryHandler()
@@ -34,45 +70,36 @@ class FlightAnalyzer:
         patterns = {}
 
         # Altitude changes
-        altitude_data = flight_data.get('altitude_data', [])
-        if altitude_data:
-            altitudes = [d['altitude'] for d in altitude_data if d['altitude'] is not None]
-            timestamps = [d['timestamp'] for d in altitude_data if d['altitude'] is not None]
-            if len(altitudes) > 1:
-                diffs = [altitudes[i] - altitudes[i-1] for i in range(1, len(altitudes))]
-                max_drop = min(diffs)
-                max_rise = max(diffs)
-                patterns['altitude_changes'] = {
-                    'max_drop': max_drop,
-                    'max_rise': max_rise,
-                    'all_diffs': diffs[:100]  # limit for brevity
-                }
+        altitudes = channel_values(flight_data.get('altitude_data'), 'absolute_alt')
+        if len(altitudes) > 1:
+            diffs = np.diff(altitudes)
+            patterns['altitude_changes'] = {
+                'max_drop': float(diffs.min()),
+                'max_rise': float(diffs.max()),
+                'all_diffs': diffs[:100].tolist()  # limit for brevity
+            }
 
         # Battery voltage changes
-        battery_data = flight_data.get('battery_data', [])
-        if battery_data:
-            voltages = [d['voltage'] for d in battery_data if d['voltage'] is not None]
-            if len(voltages) > 1:
-                diffs = [voltages[i] - voltages[i-1] for i in range(1, len(voltages))]
-                patterns['battery_voltage_changes'] = {
-                    'max_drop': min(diffs),
-                    'max_rise': max(diffs),
-                    'all_diffs': diffs[:100]
-                }
+        voltages = channel_values(flight_data.get('battery_data'), 'voltage')
+        if len(voltages) > 1:
+            diffs = np.diff(voltages)
+            patterns['battery_voltage_changes'] = {
+                'max_drop': float(diffs.min()),
+                'max_rise': float(diffs.max()),
+                'all_diffs': diffs[:100].tolist()
+            }
 
         # GPS fix pattern
-        gps_data = flight_data.get('gps_data', [])
-        if gps_data:
-            fix_types = [d.get('fix_type', 3) for d in gps_data]
-            patterns['gps_fix_types'] = fix_types[:100]
+        gps_data = flight_data.get('gps_data')
+        if channel_length(gps_data):
+            fix_types = np.nan_to_num(channel_column(gps_data, 'fix_type')[:100], nan=3)
+            patterns['gps_fix_types'] = fix_types.astype(int).tolist()
 
         # Attitude changes
-        attitude_data = flight_data.get('attitude_data', [])
-        if attitude_data:
-            rolls = [d['roll'] for d in attitude_data if d['roll'] is not None]
-            pitches = [d['pitch'] for d in attitude_data if d['pitch'] is not None]
-            patterns['attitude_rolls'] = rolls[:100]
-            patterns['attitude_pitches'] = pitches[:100]
+        attitude_data = flight_data.get('attitude_data')
+        if channel_length(attitude_data):
+            patterns['attitude_rolls'] = channel_values(attitude_data, 'roll')[:100].tolist()
+            patterns['attitude_pitches'] = channel_values(attitude_data, 'pitch')[:100].tolist()
 
         # Error messages
         errors = flight_data.get('errors', [])
@@ -84,6 +111,11 @@ class FlightAnalyzer:
     async def prepare_comprehensive_flight_context(self, flight_data: Dict[str, Any], session_id: str) -> str:
         """Prepare comprehensive flight data context for LLM analysis, prioritizing Redis summary data"""
         try:
+            context = self._context_cache.get(session_id)
+            if context is not None:
+                logger.debug(f"Using cached context for session_id: {session_id}")
+                return context
+            
             context_parts = []
             context_parts.append("=== FLIGHT DATA ANALYSIS ===")
             logger.debug(f"Preparing context for session_id: {session_id}")
@@ -93,7 +125,13 @@ class FlightAnalyzer:
             
             if redis_flight_data:
                 logger.info("Using Redis flight data for context generation")
-                return await self._format_redis_context(redis_flight_data, session_id)
+                summary = await self._get_redis_summary(session_id)
+                context = await self._format_redis_context(redis_flight_data, session_id, summary)
+                # The summary is stored in the background after upload, so only
+                # a context built with it is final and safe to reuse
+                if summary:
+                    self._cache_context(session_id, context)
+                return context
             else:
                 logger.info("Redis data not available, using raw flight_data")
                 return await self._format_raw_context(flight_data, session_id)
@@ -102,35 +140,32 @@ class FlightAnalyzer:
             logger.error(f"Error preparing comprehensive context: {e}")
             return "Flight data available but detailed analysis failed."
     
+    def _cache_context(self, session_id: str, context: str):
+        """Remember a session's context, evicting the oldest entry when full"""
+        if len(self._context_cache) >= MAX_CACHED_CONTEXTS:
+            self._context_cache.pop(next(iter(self._context_cache)))
+        self._context_cache[session_id] = context
+    
     async def _get_redis_flight_data(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Try to get flight data from Redis with multiple key formats"""
-        # session_id should be in format "filename:timestamp"
-        possible_keys = [
-            session_id,  # Direct session_id (filename:timestamp)
-            f"flight_data:{session_id}",
-            f"{session_id}:flight_data"
-        ]
-        
-        redis_client = await self._get_redis_client()
+        """Try to get flight data from Redis for a "filename:timestamp" session id"""
+        key = redis_key(session_id)
         
-        for key in possible_keys:
-            try:
-                data = await redis_client.get(key)
-                if data:
-                    parsed_data = json.loads(data) if isinstance(data, str) else data
-                    logger.info(f"Found Redis flight data with key: {key}")
-                    return parsed_data
-            except Exception as e:
-                logger.debug(f"Failed to get data with key {key}: {e}")
-                continue
+        try:
+            redis_client = await self._get_redis_client()
+            data = await redis_client.get(key)
+            if data:
+                parsed_data = orjson.loads(data) if isinstance(data, str) else data
+                logger.info(f"Found Redis flight data with key: {key}")
+                return parsed_data
+        except Exception as e:
+            logger.debug(f"Failed to get data with key {key}: {e}")
         
         logger.info(f"No Redis flight data found for session_id: {session_id}")
         return None
     
     async def _get_redis_summary(self, session_id: str) -> Optional[str]:
         """Try to get flight summary from Redis - session_id should be filename:timestamp"""
-        # The actual Redis key format is "summary:filename:timestamp"
-        summary_key = f"summary:{session_id}"
+        summary_key = redis_key(session_id, SUMMARY_NAMESPACE)
         
         try:
             redis_client = await self._get_redis_client()
@@ -139,7 +174,7 @@ class FlightAnalyzer:
                 # Summary is stored as JSON string, need to parse it
                 if isinstance(summary, str) and summary.startswith('"') and summary.endswith('"'):
                     # Remove extra JSON quotes if present
-                    summary = json.loads(summary)
+                    summary = orjson.loads(summary)
                 logger.info(f"Found Redis summary with key: {summary_key}")
                 return summary
             else:
@@ -149,13 +184,12 @@ class FlightAnalyzer:
             logger.warning(f"Failed to get summary with key {summary_key}: {e}")
             return None
     
-    async def _format_redis_context(self, redis_data: Dict[str, Any], session_id: str) -> str:
-        """Format context using Redis data (optimized path)"""
+    async def _format_redis_context(self, redis_data: Dict[str, Any], session_id: str, summary: Optional[str]) -> str:
+        """Format context using Redis data and the flight summary stored for it (optimized path)"""
         context_parts = ["=== FLIGHT DATA ANALYSIS ==="]
         
         # 1. Flight Summary from Redis (simple string summary)
         try:
-            summary = await self._get_redis_summary(session_id)
             if summary:
                 context_parts.append(f"Flight Summary: {summary}")
             else:
@@ -179,74 +213,51 @@ class FlightAnalyzer:
         if stats:
             context_parts.append("\n=== KEY FLIGHT STATISTICS ===")
             
-            # Priority stats for LLM analysis
-            priority_stats = [
-                ('max_altitude', 'Max Altitude', 'm'),
-                ('max_battery_voltage', 'Max Battery Voltage', 'V'),
-                ('min_battery_voltage', 'Min Battery Voltage', 'V'),
-                ('battery_voltage_drop', 'Battery Voltage Drop', 'V'),
-                ('avg_current', 'Average Current', 'A'),
-                ('max_current', 'Max Current', 'A'),
-                ('total_current_consumed', 'Total Current Consumed', 'mAh'),
-                ('avg_satellites', 'Average GPS Satellites', ''),
-                ('min_satellites', 'Min GPS Satellites', ''),
-                ('gps_loss_events', 'GPS Loss Events', ''),
-                ('rc_loss_events', 'RC Loss Events', ''),
-                ('max_roll', 'Max Roll Angle', '°'),
-                ('max_pitch', 'Max Pitch Angle', '°'),
-                ('max_cpu_load', 'Max CPU Load', '%'),
-                ('avg_cpu_load', 'Average CPU Load', '%')
-            ]
-            
             stats_shown = 0
-            for key, label, unit in priority_stats:
-                if key in stats and stats[key] is not None and stats_shown < 12:  # Limit to 12 key stats
-                    value = stats[key]
-                    if isinstance(value, (int, float)):
-                        if unit == '°':
-                            context_parts.append(f"{label}: {abs(value):.1f}{unit}")
-                        elif unit == '%':
-                            context_parts.append(f"{label}: {value:.1f}{unit}")
-                        elif unit in ['V', 'A']:
-                            context_parts.append(f"{label}: {value:.2f}{unit}")
-                        elif unit == 'm':
-                            context_parts.append(f"{label}: {value:.1f}{unit}")
-                        elif unit == 'mAh':
-                            context_parts.append(f"{label}: {value:.0f}{unit}")
-                        else:
-                            context_parts.append(f"{label}: {value:.0f}{unit}")
-                        stats_shown += 1
+            for key, label, unit, spec in KEY_STATS:
+                if stats_shown == MAX_KEY_STATS:
+                    break
+                value = stats.get(key)
+                if isinstance(value, (int, float)):
+                    if unit == '°':
+                        value = abs(value)
+                    context_parts.append(f"{label}: {value:{spec}}{unit}")
+                    stats_shown += 1
         
         # 3. Critical Issues Summary (optimized)
         errors = redis_data.get('errors', [])
         if errors:
-            critical_errors = [e for e in errors if e.get('severity', 10) <= 4]
-            if critical_errors:
+            # Filter and group similar critical/warning messages in a single pass
+            critical_count = 0
+            error_groups = {}
+            for error in errors:
+                if error.get('severity', 10) > 4:
+                    continue
+                critical_count += 1
+                text = error.get('text', 'Unknown error')
+                # Group by error text (simplified)
+                error_key = text[:50]  # First 50 chars as grouping key
+                group = error_groups.get(error_key)
+                if group is None:
+                    group = error_groups[error_key] = {
+                        'count': 0,
+                        'first_time': error.get('timestamp', 0),
+                        'severity': error.get('severity', 6),
+                        'full_text': text
+                    }
+                group['count'] += 1
+            
+            if critical_count:
                 context_parts.append(f"\n=== CRITICAL ISSUES SUMMARY ===")
-                context_parts.append(f"Total critical/warning messages: {len(critical_errors)}")
-                
-                # Group similar errors
-                error_groups = {}
-                for error in critical_errors:
-                    text = error.get('text', 'Unknown error')
-                    # Group by error text (simplified)
-                    error_key = text[:50]  # First 50 chars as grouping key
-                    if error_key not in error_groups:
-                        error_groups[error_key] = {
-                            'count': 0,
-                            'first_time': error.get('timestamp', 0),
-                            'severity': error.get('severity', 6),
-                            'full_text': text
-                        }
-                    error_groups[error_key]['count'] += 1
+                context_parts.append(f"Total critical/warning messages: {critical_count}")
                 
                 # Show top 3 error types
-                sorted_errors = sorted(error_groups.items(), 
-                                     key=lambda x: (x[1]['severity'], -x[1]['count']))
+                top_errors = heapq.nsmallest(3, error_groups.items(),
+                                             key=lambda x: (x[1]['severity'], -x[1]['count']))
                 
-                for error_key, info in sorted_errors[:3]:
+                for error_key, info in top_errors:
                     time_str = format_flight_time(info['first_time'], redis_data)
-                    severity_name = {1: 'Emergency', 2: 'Critical', 3: 'Error', 4: 'Warning'}.get(info['severity'], 'Unknown')
+                    severity_name = SEVERITY_NAMES.get(info['severity'], 'Unknown')
                     if info['count'] > 1:
                         context_parts.append(f"  {time_str} [{severity_name}]: {info['full_text']} (occurred {info['count']} times)")
                     else:
@@ -305,16 +316,16 @@ class FlightAnalyzer:
         
         # Data arrays summary
         data_summary = []
-        if redis_data.get('altitude_data'):
-            data_summary.append(f"Altitude({len(redis_data['altitude_data'])})")
-        if redis_data.get('battery_data'):
-            data_summary.append(f"Battery({len(redis_data['battery_data'])})")
-        if redis_data.get('gps_data'):
-            data_summary.append(f"GPS({len(redis_data['gps_data'])})")
-        if redis_data.get('rc_data'):
-            data_summary.append(f"RC({len(redis_data['rc_data'])})")
-        if redis_data.get('attitude_data'):
-            data_summary.append(f"Attitude({len(redis_data['attitude_data'])})")
+        for key, label in (
+            ('altitude_data', 'Altitude'),
+            ('battery_data', 'Battery'),
+            ('gps_data', 'GPS'),
+            ('rc_data', 'RC'),
+            ('attitude_data', 'Attitude')
+        ):
+            count = channel_length(redis_data.get(key))
+            if count:
+                data_summary.append(f"{label}({count})")
         
         if data_summary:
             context_parts.append(f"Processed arrays: {', '.join(data_summary)}")
@@ -499,12 +510,14 @@ Summary (max {target_word_limit} words):"""
 
     def _load_prompt(self, filename: str, word_limit: int = 80) -> str:
         """Load prompt file with include support and template variables"""
-        prompt_path = os.path.join(os.path.dirname(__file__), 'prompts', filename)
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Process includes: {{include:path/to/file.md}}
-        content = self._process_includes(content)
+        content = self._prompt_cache.get(filename)
+        if content is None:
+            prompt_path = os.path.join(os.path.dirname(__file__), 'prompts', filename)
+            with open(prompt_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            # Process includes: {{include:path/to/file.md}}
+            content = self._prompt_cache[filename] = self._process_includes(content)
         
         # Replace template variables
         content = content.replace('{word_limit}', str(word_limit))
@@ -14,6 +14,8 @@ class QueryHandler:
             r'\b(what happened|any issues|problems|status|summary)\s*$',
             r'\b(help|info|information)\s*$'
         ]
+        # Created on first use and kept, so its HTTP connection pool is reused
+        self.llm_client = None
 
     async def check_for_clarification(self, message: str, flight_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Check if query needs clarification and return clarification response if needed"""
@@ -96,8 +98,9 @@ class QueryHandler:
             formatted_prompt = prompt_template.format(question=message)
             
             # Generate clarifying questions using LLM
-            llm_client = LLMClient()
-            response = await llm_client.generate_response(formatted_prompt)
+            if self.llm_client is None:
+                self.llm_client = LLMClient()
+            response = await self.llm_client.generate_response(formatted_prompt)
             
             # Parse the response to extract individual questions
             # Look for numbered lists, bullet points, or question marks
@@ -1,9 +1,18 @@
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=32)
+def _parse_start_time(start_time: str) -> datetime:
+    """Parse an ISO start_time string as stored in Redis (cached, reused for every line)"""
+    try:
+        return datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+    except ValueError:
+        return datetime.fromisoformat(start_time)
+
 def format_flight_time(timestamp: float, flight_data: Optional[Dict[str, Any]] = None) -> str:
     """Format flight timestamp into a readable format"""
     # Convert to minutes and seconds for better readability
@@ -22,10 +31,7 @@ def format_flight_time(timestamp: float, flight_data: Optional[Dict[str, Any]] =
             
             # Handle different start_time formats
             if isinstance(start_time, str):
-                try:
-                    start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                except ValueError:
-                    start_dt = datetime.fromisoformat(start_time)
+                start_dt = _parse_start_time(start_time)
             elif hasattr(start_time, 'strftime'):
                 start_dt = start_time
             else:
@@ -1,20 +1,34 @@
 import os
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+import asyncio
+import tempfile
+import aiofiles
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uvicorn
 from dotenv import load_dotenv
 import logging
-import datetime
-import json
+from datetime import datetime
+import orjson
+import blake3
 import redis.asyncio as aioredis
 
 from agent.agent_manager import ChatbotAgent
 from agent.query_handler import QueryHandler
 from llm.llm_client import LLMClient
 from mavlink_parser.parser import MAVLinkParser
-from models.chat_models import ChatMessage, ChatResponse, FlightDataQuery
+from models.chat_models import ChatMessage, ChatResponse, FlightDataQuery, FlightInfo, UploadResponse
+from storage import (
+    SUMMARY_NAMESPACE,
+    CHAT_HISTORY_NAMESPACE,
+    KEY_DIGEST_BYTES,
+    content_key,
+    make_session_id,
+    redis_key
+)
 
 # Load environment variables
 load_dotenv()
@@ -22,17 +36,35 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="UAV Chatbot Backend", version="1.0.0")
+app = FastAPI(
+    title="UAV Chatbot Backend",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
+
+def parse_cors_origins(value: str) -> List[str]:
+    """Parse CORS_ORIGINS given as a JSON list or a comma-separated string"""
+    value = value.strip()
+    if value.startswith("["):
+        return orjson.loads(value)
+    return [origin.strip() for origin in value.split(",") if origin.strip()]
 
-# Configure CORS for frontend communication
+# Configure CORS for frontend communication. Explicit origins plus max_age
+# let browsers cache preflight results instead of repeating OPTIONS requests.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=parse_cors_origins(
+        os.getenv('CORS_ORIGINS', 'http://localhost:8080,http://127.0.0.1:8080')
+    ),
+    allow_credentials=os.getenv('CORS_ALLOW_CREDENTIALS', 'true').lower() == 'true',
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
+# Compress larger responses (summaries, upload results) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # Initialize global components
 chatbot_agent = ChatbotAgent()
 mavlink_parser = MAVLinkParser()
@@ -40,10 +72,18 @@ mavlink_parser = MAVLinkParser()
 # Redis connection (singleton)
 redis = None
 
-def convert_datetime(obj):
-    if isinstance(obj, datetime.datetime):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
+# Uploads are read and hashed in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Number of chat messages kept per flight log session
+MAX_CHAT_HISTORY = 50
+
+# Directory for temporary upload files (point at a tmpfs mount to avoid disk I/O)
+UPLOAD_DIR = os.getenv('UPLOAD_DIR', tempfile.gettempdir())
+
+def dump_json(obj) -> bytes:
+    """Serialize to JSON; datetime and NumPy values are encoded natively by orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
 
 @app.on_event("startup")
 async def startup_event():
@@ -65,8 +105,9 @@ async def root():
 async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
-@app.post("/upload-flight-log")
+@app.post("/upload-flight-log", response_model=UploadResponse)
 async def upload_flight_log(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     timestamp: str = Query(..., description="Upload timestamp (e.g., 20240607T153000)")
 ):
@@ -84,54 +125,69 @@ async def upload_flight_log(
                 detail="Only .bin and .tlog files are supported"
             )
         
-        # Save uploaded file temporarily
-        temp_path = f"temp_{file.filename}"
-        content = await file.read()
-        logger.info(f"File size: {len(content)} bytes")
-        
-        with open(temp_path, "wb") as f:
-            f.write(content)
+        # Save uploaded file temporarily, hashing the content as it is written.
+        # The extension is kept since pymavlink picks the log format from it.
+        fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file.filename)[1], dir=UPLOAD_DIR)
+        os.close(fd)
+        try:
+            hasher = blake3.blake3()
+            file_size = 0
+            async with aiofiles.open(temp_path, "wb") as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    await f.write(chunk)
+                    file_size += len(chunk)
+            logger.info(f"File size: {file_size} bytes")
+            upload_content_key = content_key(hasher.hexdigest(length=KEY_DIGEST_BYTES))
+            
+            # Reuse the parse result of an identical upload if it is still cached
+            parsed_data = await get_parsed_data_by_content(upload_content_key)
+            if parsed_data:
+                logger.info(f"Duplicate upload, reusing parsed data for {upload_content_key}")
+            else:
+                # Parse the MAVLink data
+                logger.info(f"Starting to parse file: {temp_path}")
+                parsed_data = await mavlink_parser.parse_file(temp_path)
+                logger.info(f"Parsed data keys: {list(parsed_data.keys()) if parsed_data else 'None'}")
+        finally:
+            # Clean up temp file
+            await asyncio.to_thread(os.remove, temp_path)
         
-        # Parse the MAVLink data
-        logger.info(f"Starting to parse file: {temp_path}")
-        parsed_data = await mavlink_parser.parse_file(temp_path)
-        logger.info(f"Parsed data keys: {list(parsed_data.keys()) if parsed_data else 'None'}")
+        # Keep the original identifiers in the value since the key is hashed
+        parsed_data["source"] = {"filename": file.filename, "timestamp": timestamp}
         
-        # Store parsed data in Redis with the key 'filename:timestamp'
-        redis_key = f"{file.filename}:{timestamp}"
-        await redis.set(redis_key, json.dumps(parsed_data, default=convert_datetime), ex=86400)
-        logger.info(f"Stored flight data in Redis. Key: {redis_key}")
+        # Store parsed data in Redis under the hashed 'filename:timestamp' session id
+        session_id = make_session_id(file.filename, timestamp)
+        flight_key = redis_key(session_id)
+        await redis.set(flight_key, dump_json(parsed_data), ex=86400)
+        await redis.set(upload_content_key, flight_key, ex=86400)
+        logger.info(f"Stored flight data in Redis. Key: {flight_key}")
         
-        # Store summary separately as 'summary:filename:timestamp'
-        flight_summary = await mavlink_parser.generate_summary(parsed_data)
-        summary_key = f"summary:{file.filename}:{timestamp}"
-        await redis.set(summary_key, json.dumps(flight_summary, default=convert_datetime), ex=86400)
-        logger.info(f"Stored flight summary in Redis. Key: {summary_key}")
-        
-        # Clean up temp file
-        os.remove(temp_path)
+        # Generate and store the summary after the response has been sent
+        summary_key = redis_key(session_id, SUMMARY_NAMESPACE)
+        background_tasks.add_task(compute_and_store_summary, parsed_data, summary_key)
         
         # Format duration
-        duration = parsed_data.get("flight_duration", 0)
-        if duration and duration > 0:
+        duration = parsed_data.get("flight_duration") or 0
+        if duration > 0:
             minutes = int(duration // 60)
             seconds = int(duration % 60)
             duration_text = f"{minutes}m {seconds}s"
         else:
             duration_text = "Unknown"
         
-        response_data = {
-            "message": "Flight log uploaded and parsed successfully",
-            "flight_info": {
-                "duration": duration_text,
-                "duration_seconds": parsed_data.get("flight_duration", 0),
-                "messages_count": len(parsed_data.get("messages", [])),
-                "start_time": parsed_data.get("start_time", "Unknown"),
-                "vehicle_type": parsed_data.get("vehicle_type", "Unknown"),
-                "max_altitude": parsed_data.get("flight_stats", {}).get("max_altitude", "Unknown"),
-                "summary": flight_summary
-            }
-        }
+        flight_stats = parsed_data.get("flight_stats") or {}
+        response_data = UploadResponse(
+            message="Flight log uploaded and parsed successfully",
+            flight_info=FlightInfo(
+                duration=duration_text,
+                duration_seconds=duration,
+                messages_count=parsed_data.get("messages_count", 0),
+                start_time=parsed_data.get("start_time") or "Unknown",
+                vehicle_type=parsed_data.get("vehicle_type", "Unknown"),
+                max_altitude=flight_stats.get("max_altitude", "Unknown")
+            )
+        )
         logger.info(f"Returning response: {response_data}")
         return response_data
         
@@ -156,17 +212,18 @@ async def chat_with_bot(
                 content="No flight data loaded. Please upload a .bin or .tlog flight log file first.",
                 message_type="info"
             )
-        # Load chat history
-        history = await get_chat_history(filename, timestamp)
-        history.append({"role": "user", "content": message.content})
-        # Pass history to agent if needed
         response = await chatbot_agent.process_message(
-            message.content, 
+            message.content,
             current_flight_data,
             message.session_id
         )
-        history.append({"role": "assistant", "content": response["content"]})
-        await save_chat_history(filename, timestamp, history)
+        # Append this exchange to the chat history
+        await append_chat_history(
+            filename,
+            timestamp,
+            {"role": "user", "content": message.content},
+            {"role": "assistant", "content": response["content"]}
+        )
         return ChatResponse(
             content=response["content"],
             message_type=response.get("type", "response"),
@@ -178,38 +235,66 @@ async def chat_with_bot(
 
 @app.get("/flight-summary")
 async def get_flight_summary(
+    response: Response,
     filename: str = Query(..., description="Flight log file name (e.g., log1.bin)"),
     timestamp: str = Query(..., description="Upload timestamp (e.g., 20240607T153000)")
 ):
     """Get a summary of the currently loaded flight data"""
-    summary_key = f"summary:{filename}:{timestamp}"
-    summary_data = await redis.get(summary_key)
+    session_id = make_session_id(filename, timestamp)
+    summary_data = await redis.get(redis_key(session_id, SUMMARY_NAMESPACE))
     if not summary_data:
+        # Flight data is stored before the summary is generated in the background
+        if await redis.exists(redis_key(session_id)):
+            response.status_code = 202
+            return {"status": "pending"}
         raise HTTPException(status_code=404, detail="No summary data loaded for this file/timestamp")
     try:
-        summary = json.loads(summary_data)
+        summary = orjson.loads(summary_data)
         return {"summary": summary}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading summary: {str(e)}")
 
 
+async def compute_and_store_summary(parsed_data: Dict[str, Any], summary_key: str):
+    """Background task: generate the flight summary and store it in Redis"""
+    try:
+        flight_summary = mavlink_parser.generate_summary(parsed_data)
+        await redis.set(summary_key, dump_json(flight_summary), ex=86400)
+        logger.info(f"Stored flight summary in Redis. Key: {summary_key}")
+    except Exception as e:
+        logger.error(f"Error generating flight summary: {str(e)}", exc_info=True)
+
+async def get_parsed_data_by_content(upload_content_key: str):
+    """Return the parsed data previously stored for identical file content, if any"""
+    flight_key = await redis.get(upload_content_key)
+    if not flight_key:
+        return None
+    data = await redis.get(flight_key)
+    if not data:
+        return None
+    parsed_data = orjson.loads(data)
+    # JSON stores datetimes as ISO strings; restore them so the result matches a fresh parse
+    for field in ("start_time", "end_time"):
+        if isinstance(parsed_data.get(field), str):
+            parsed_data[field] = datetime.fromisoformat(parsed_data[field])
+    return parsed_data
+
 async def get_flight_data(filename: str, timestamp: str):
     if not filename or not timestamp:
         return None
-    redis_key = f"{filename}:{timestamp}"
-    data = await redis.get(redis_key)
+    data = await redis.get(redis_key(make_session_id(filename, timestamp)))
     if not data:
         return None
-    return json.loads(data)
-
-async def get_chat_history(filename: str, timestamp: str):
-    key = f"chat_history:{filename}:{timestamp}"
-    data = await redis.get(key)
-    return json.loads(data) if data else []
+    return orjson.loads(data)
 
-async def save_chat_history(filename: str, timestamp: str, history: list):
-    key = f"chat_history:{filename}:{timestamp}"
-    await redis.set(key, json.dumps(history, default=convert_datetime), ex=86400)
+async def append_chat_history(filename: str, timestamp: str, *messages: Dict[str, Any]):
+    """Append messages to the chat history, keeping only the most recent ones"""
+    key = redis_key(make_session_id(filename, timestamp), CHAT_HISTORY_NAMESPACE)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.rpush(key, *(dump_json(message) for message in messages))
+        pipe.ltrim(key, -MAX_CHAT_HISTORY, -1)
+        pipe.expire(key, 86400)
+        await pipe.execute()
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,89 @@
+"""
+Columnar Telemetry Buffers
+
+Per-channel struct-of-arrays storage used by the parser. Each channel fills
+fixed-size float64 row chunks and concatenates them once when the columns are
+read, instead of building a Python dict per message. Missing values are stored
+as NaN, which is serialized as null.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# Rows per chunk. np.empty only reserves address space, so the unused part of a
+# channel's current chunk costs no physical memory.
+CHUNK_ROWS = 1 << 14
+
+
+class ColumnBuffer:
+    """Chunked struct-of-arrays buffer of float64 columns for one telemetry channel"""
+
+    def __init__(self, fields: Sequence[str], chunk_rows: int = CHUNK_ROWS):
+        self.fields = tuple(fields)
+        self._chunk_rows = chunk_rows
+        self._chunks = []
+        self._current = np.empty((chunk_rows, len(self.fields)))
+        self._filled = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks) * self._chunk_rows + self._filled
+
+    def append(self, row: Sequence[float]) -> None:
+        """Append one record given in field order (None or NaN for missing values)"""
+        if self._filled == self._chunk_rows:
+            self._next_chunk()
+        self._current[self._filled] = row
+        self._filled += 1
+
+    def _next_chunk(self) -> None:
+        """Retire the full current chunk and start a new one; filled rows are never copied"""
+        self._chunks.append(self._current)
+        self._current = np.empty((self._chunk_rows, len(self.fields)))
+        self._filled = 0
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return the filled rows as a dict of contiguous column arrays"""
+        chunks = self._chunks + [self._current[:self._filled]]
+        return {
+            field: np.concatenate([chunk[:, i] for chunk in chunks])
+            for i, field in enumerate(self.fields)
+        }
+
+
+def channel_length(channel) -> int:
+    """Number of records in a channel stored as a dict of columns"""
+    if not channel:
+        return 0
+    return len(channel.get('timestamp', ()))
+
+
+def channel_column(channel, field: str) -> np.ndarray:
+    """Return one column as a float array, with missing values (None) as NaN"""
+    if not channel or field not in channel:
+        return np.empty(0)
+    return np.asarray(channel[field], dtype=float)
+
+
+def channel_values(channel, field: str) -> np.ndarray:
+    """Return the present (non-missing) values of one column"""
+    values = channel_column(channel, field)
+    return values[~np.isnan(values)]
+
+
+def select_rows(channel, mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """Return a channel holding only the rows selected by a boolean mask"""
+    return {field: np.asarray(column)[mask] for field, column in channel.items()}
+
+
+def describe(values: np.ndarray) -> Tuple[float, float, float, float]:
+    """Return (min, max, mean, variance) of a non-empty column, reusing the mean for the variance"""
+    mean = values.mean()
+    centered = values - mean
+    variance = np.dot(centered, centered) / values.size
+    return float(values.min()), float(values.max()), float(mean), float(variance)
+
+
+def type_codes(message_types: Sequence[str]) -> Dict[str, int]:
+    """Map each message type to its index in a channel's message type tuple"""
+    return {msg_type: code for code, msg_type in enumerate(message_types)}
@@ -1,12 +1,25 @@
 import os
+import re
+import math
+import operator
 import asyncio
-from typing import Dict, Any, List, Optional
+from collections import Counter, defaultdict, deque
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from pymavlink import mavutil, DFReader
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 
+from .columns import (
+    ColumnBuffer,
+    channel_length,
+    channel_column,
+    channel_values,
+    select_rows,
+    describe,
+    type_codes
+)
 from .types import (
     MAV_VEHICLE_TYPES, 
     MAV_AUTOPILOT_TYPES, 
@@ -16,7 +29,33 @@ from .types import (
     ROVER_MODES,
     HELICOPTER_MODES,
     MessageSeverity,
-    SEVERITY_KEYWORDS
+    SEVERITY_KEYWORDS,
+    GPS_MESSAGE_TYPES,
+    POSITION_MESSAGE_TYPES,
+    ALTITUDE_MESSAGE_TYPES,
+    ALTITUDE_SOURCE_PRIORITY,
+    BATTERY_MESSAGE_TYPES,
+    RC_MESSAGE_TYPES,
+    ATTITUDE_MESSAGE_TYPES,
+    EKF_MESSAGE_TYPES,
+    IMU_MESSAGE_TYPES,
+    BARO_MESSAGE_TYPES,
+    MAG_MESSAGE_TYPES,
+    VIBRATION_MESSAGE_TYPES,
+    TEXT_MESSAGE_TYPES,
+    ALTITUDE_FIELDS,
+    GPS_FIELDS,
+    BATTERY_FIELDS,
+    RC_FIELDS,
+    ATTITUDE_FIELDS,
+    HEARTBEAT_FIELDS,
+    SYSTEM_STATUS_FIELDS,
+    EKF_FIELDS,
+    IMU_FIELDS,
+    BARO_FIELDS,
+    MAG_FIELDS,
+    PERFORMANCE_FIELDS,
+    VIBRATION_FIELDS
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -25,15 +64,154 @@ logger = logging.getLogger(__name__)
 # Constants
 INT16_MAX = 32767
 
+# Index of each message type within its channel, stored in 'message_type' columns
+GPS_TYPE_CODES = type_codes(GPS_MESSAGE_TYPES)
+ALTITUDE_TYPE_CODES = type_codes(ALTITUDE_MESSAGE_TYPES)
+BATTERY_TYPE_CODES = type_codes(BATTERY_MESSAGE_TYPES)
+RC_TYPE_CODES = type_codes(RC_MESSAGE_TYPES)
+ATTITUDE_TYPE_CODES = type_codes(ATTITUDE_MESSAGE_TYPES)
+EKF_TYPE_CODES = type_codes(EKF_MESSAGE_TYPES)
+IMU_TYPE_CODES = type_codes(IMU_MESSAGE_TYPES)
+BARO_TYPE_CODES = type_codes(BARO_MESSAGE_TYPES)
+MAG_TYPE_CODES = type_codes(MAG_MESSAGE_TYPES)
+VIBRATION_TYPE_CODES = type_codes(VIBRATION_MESSAGE_TYPES)
+
+# Vehicle type implied by a flight mode, checked in this order for modes shared by several vehicles
+MODE_VEHICLE_TABLES = (
+    (MULTICOPTER_MODES, "Quadrotor"),
+    (FIXED_WING_MODES, "Fixed Wing"),
+    (ROVER_MODES, "Ground Rover"),
+    (HELICOPTER_MODES, "Helicopter"),
+)
+# Flattened so each lookup is one dict probe; reversed so the earliest table wins
+MODE_VEHICLE_TYPES = {
+    mode: vehicle_type
+    for modes, vehicle_type in reversed(MODE_VEHICLE_TABLES)
+    for mode in modes
+}
+
+# One case-insensitive keyword pattern per severity, checked in SEVERITY_KEYWORDS order
+SEVERITY_PATTERNS = [
+    (severity, re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE))
+    for severity, keywords in SEVERITY_KEYWORDS.items()
+]
+
+# Attribute groups fetched in one call from GPS messages with a fixed layout
+DATAFLASH_GPS_GETTER = operator.attrgetter('Lat', 'Lng', 'Alt')
+GPS_RAW_INT_GETTER = operator.attrgetter(
+    'lat', 'lon', 'alt', 'fix_type', 'satellites_visible', 'eph', 'epv', 'vel', 'cog'
+)
+GLOBAL_POSITION_INT_GETTER = operator.attrgetter(
+    'lat', 'lon', 'alt', 'relative_alt', 'vx', 'vy', 'vz', 'hdg'
+)
+
+# Least severe level recorded in parsed_data["errors"] (warnings and above)
+MAX_ERROR_SEVERITY = MessageSeverity.WARNING
+
+# Most recent warning/error messages kept per log; older ones are counted as dropped
+MAX_ERRORS = 10000
+
+# Number of leading GPS_FIELDS shared with ALTITUDE_FIELDS (GPS codes match altitude codes)
+GPS_ALTITUDE_FIELDS = len(ALTITUDE_FIELDS)
+
+# Column layout of each telemetry channel, keyed by its parsed_data key
+CHANNEL_FIELDS = {
+    "altitude_data": ALTITUDE_FIELDS,
+    "battery_data": BATTERY_FIELDS,
+    "gps_data": GPS_FIELDS,
+    "rc_data": RC_FIELDS,
+    "attitude_data": ATTITUDE_FIELDS,
+    "heartbeat_data": HEARTBEAT_FIELDS,
+    "system_status": SYSTEM_STATUS_FIELDS,
+    "ekf_data": EKF_FIELDS,
+    "imu_data": IMU_FIELDS,
+    "baro_data": BARO_FIELDS,
+    "mag_data": MAG_FIELDS,
+    "performance_data": PERFORMANCE_FIELDS,
+    "vibration_data": VIBRATION_FIELDS
+}
+
+# Sensor channels only included in parsed_data when the log contains them
+OPTIONAL_CHANNELS = ("ekf_data", "imu_data", "baro_data", "mag_data", "performance_data", "vibration_data")
+
 class MAVLinkParser:
     def __init__(self):
         # Import types from types module
         self.supported_message_types = SUPPORTED_MESSAGE_TYPES
         self.mav_vehicle_types = MAV_VEHICLE_TYPES
         self.mav_autopilot_types = MAV_AUTOPILOT_TYPES
+        # Message type -> handler, so each message costs a single dict lookup
+        self._dispatch = self._build_dispatch()
+
+    @staticmethod
+    def _message_layout(msg) -> Tuple[frozenset, Callable[[Any], float]]:
+        """Return the field names of a message type and a getter for its timestamp in seconds"""
+        fields = frozenset(msg.get_fieldnames())
+        # Get timestamp (different methods for different log types)
+        if 'TimeUS' in fields:
+            get_timestamp = lambda m: m.TimeUS / 1000000.0  # Convert microseconds to seconds
+        elif hasattr(msg, '_timestamp'):
+            get_timestamp = operator.attrgetter('_timestamp')
+        else:
+            get_timestamp = lambda m: 0
+        return fields, get_timestamp
+
+    @staticmethod
+    def _select_altitude_source(altitude_data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Keep only the rows of the preferred altitude source present in the log"""
+        codes = altitude_data["message_type"]
+        for msg_type in ALTITUDE_SOURCE_PRIORITY:
+            mask = codes == ALTITUDE_TYPE_CODES[msg_type]
+            if mask.any():
+                return altitude_data if mask.all() else select_rows(altitude_data, mask)
+        return altitude_data
+
+    def _build_dispatch(self) -> Dict[str, Callable]:
+        """Build the message type dispatch table used by parse_file"""
+        dispatch = {
+            'HEARTBEAT': self._handle_heartbeat,
+            'SYS_STATUS': self._handle_sys_status,
+            'MODE': self._handle_mode
+        }
+        for msg_type in GPS_MESSAGE_TYPES:
+            dispatch[msg_type] = self._handle_gps
+        for msg_type in TEXT_MESSAGE_TYPES:
+            dispatch[msg_type] = self._handle_text_message
+        
+        for msg_types, extract, channel in (
+            (POSITION_MESSAGE_TYPES, self._extract_position_data, "altitude_data"),
+            (BATTERY_MESSAGE_TYPES, self._extract_battery_data, "battery_data"),
+            (RC_MESSAGE_TYPES, self._extract_rc_data, "rc_data"),
+            (ATTITUDE_MESSAGE_TYPES, self._extract_attitude_data, "attitude_data"),
+            (EKF_MESSAGE_TYPES, self._extract_ekf_data, "ekf_data"),
+            (IMU_MESSAGE_TYPES, self._extract_imu_data, "imu_data"),
+            (BARO_MESSAGE_TYPES, self._extract_baro_data, "baro_data"),
+            (MAG_MESSAGE_TYPES, self._extract_mag_data, "mag_data"),
+            (('PM',), self._extract_performance_data, "performance_data"),
+            (VIBRATION_MESSAGE_TYPES, self._extract_vibration_data, "vibration_data")
+        ):
+            handler = self._channel_handler(extract, channel)
+            for msg_type in msg_types:
+                dispatch[msg_type] = handler
+        
+        return dispatch
+
+    @staticmethod
+    def _channel_handler(extract: Callable, channel: str) -> Callable:
+        """Create a handler that appends the extracted row to a single channel"""
+        def handle(msg, timestamp, msg_type, fields, parsed_data, channels):
+            row = extract(msg, timestamp, msg_type, fields)
+            if row:
+                channels[channel].append(row)
+        return handle
 
     async def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse an ArduPilot DataFlash .bin file or MAVLink telemetry .tlog file and extract flight data"""
+        # Parsing is CPU-bound, so run it in a worker thread to keep the event loop responsive
+        return await asyncio.to_thread(self._parse_sync, file_path)
+
+    def _parse_sync(self, file_path: str) -> Dict[str, Any]:
+        """Blocking implementation of parse_file"""
         try:
             logger.info(f"Starting to parse file: {file_path}")
             
@@ -41,7 +219,7 @@ class MAVLinkParser:
             mlog = mavutil.mavlink_connection(file_path)
             
             parsed_data = {
-                "messages": [],
+                "messages_count": 0,
                 "flight_stats": {},
                 "timeline": [],
                 "errors": [],
@@ -53,35 +231,38 @@ class MAVLinkParser:
                 "component_id": None
             }
             
-            message_counts = {}
-            altitude_data = []
-            battery_data = []
-            gps_data = []
-            rc_data = []
-            attitude_data = []
-            modes = []
-            heartbeat_data = []
-            system_status = []
+            # Telemetry channels are accumulated column-wise (see ColumnBuffer)
+            message_counts = defaultdict(int)
+            channels = {key: ColumnBuffer(fields) for key, fields in CHANNEL_FIELDS.items()}
+            parsed_data["modes"] = []
+            parsed_data["errors"] = deque(maxlen=MAX_ERRORS)
+            parsed_data["errors_dropped"] = 0
+            dispatch = self._dispatch
+            message_layouts = {}
+            # DataFlash readers' recv_msg() only forwards to _parse_next(), so call it directly
+            if isinstance(mlog, DFReader.DFReader):
+                recv_msg = mlog._parse_next
+            else:
+                recv_msg = mlog.recv_msg
             
             start_timestamp = None
             end_timestamp = None
             
-            # Parse messages
-            while True:
+            # Parse messages. recv_msg() returns None at the end of the log and,
+            # unlike recv_match(), skips the per-call type/condition filtering.
+            while (msg := recv_msg()) is not None:
                 try:
-                    msg = mlog.recv_match(blocking=False)
-                    if msg is None:
-                        break
-                    
                     msg_type = msg.get_type()
                     
-                    # Get timestamp (different methods for different log types)
-                    if hasattr(msg, 'TimeUS'):
-                        timestamp = msg.TimeUS / 1000000.0  # Convert microseconds to seconds
-                    elif hasattr(msg, '_timestamp'):
-                        timestamp = msg._timestamp
-                    else:
-                        timestamp = 0
+                    # Field names, the timestamp source and the handler are fixed per
+                    # message type within a log, so resolve them once per type
+                    layout = message_layouts.get(msg_type)
+                    if layout is None:
+                        layout = message_layouts[msg_type] = self._message_layout(msg) + (dispatch.get(msg_type),)
+                        # Debug: Log the first occurrence of each message type
+                        logger.info(f"Found message type: {msg_type}")
+                    fields, get_timestamp, handler = layout
+                    timestamp = get_timestamp(msg)
                     
                     if start_timestamp is None and timestamp > 0:
                         start_timestamp = timestamp
@@ -89,166 +270,11 @@ class MAVLinkParser:
                         end_timestamp = timestamp
                     
                     # Count message types
-                    message_counts[msg_type] = message_counts.get(msg_type, 0) + 1
-                    
-                    # Debug: Log the first occurrence of each message type
-                    if message_counts[msg_type] == 1:
-                        logger.info(f"Found message type: {msg_type}")
-                    
-                    # Process HEARTBEAT messages for vehicle identification (MAVLink standard)
-                    if msg_type == 'HEARTBEAT':
-                        heartbeat_data.append({
-                            'timestamp': timestamp,
-                            'type': msg.type,
-                            'autopilot': msg.autopilot,
-                            'base_mode': msg.base_mode,
-                            'custom_mode': msg.custom_mode,
-                            'system_status': msg.system_status,
-                            'mavlink_version': msg.mavlink_version
-                        })
-                        
-                        # Determine vehicle type from HEARTBEAT message
-                        if parsed_data["vehicle_type"] == "Unknown":
-                            vehicle_type_id = msg.type
-                            parsed_data["vehicle_type"] = self.mav_vehicle_types.get(vehicle_type_id, f"Unknown Type {vehicle_type_id}")
-                            
-                        # Determine autopilot type
-                        if parsed_data["autopilot_type"] == "Unknown":
-                            autopilot_id = msg.autopilot
-                            parsed_data["autopilot_type"] = self.mav_autopilot_types.get(autopilot_id, f"Unknown Autopilot {autopilot_id}")
-                    
-                    # Process SYS_STATUS messages for system health
-                    elif msg_type == 'SYS_STATUS':
-                        system_status.append({
-                            'timestamp': timestamp,
-                            'onboard_control_sensors_present': msg.onboard_control_sensors_present,
-                            'onboard_control_sensors_enabled': msg.onboard_control_sensors_enabled,
-                            'onboard_control_sensors_health': msg.onboard_control_sensors_health,
-                            'load': msg.load,
-                            'voltage_battery': msg.voltage_battery,
-                            'current_battery': msg.current_battery,
-                            'battery_remaining': msg.battery_remaining,
-                            'drop_rate_comm': msg.drop_rate_comm
-                        })
-                    
-                    # Extract specific data based on message type
-                    elif msg_type in ['GPS', 'GPS2']:
-                        gps_info = self._extract_gps_data(msg, timestamp, msg_type)
-                        if gps_info:
-                            if gps_info.get('altitude') is not None:
-                                altitude_data.append(gps_info)
-                            gps_data.append(gps_info)
+                    message_counts[msg_type] += 1
                     
-                    elif msg_type == 'GPA':
-                        gps_info = self._extract_gps_data(msg, timestamp, msg_type)
-                        if gps_info:
-                            if gps_info.get('hdop') is not None or gps_info.get('vdop') is not None:
-                                gps_data.append(gps_info)
-                    
-                    elif msg_type in ['GPS_RAW_INT', 'GLOBAL_POSITION_INT']:
-                        gps_info = self._extract_gps_data(msg, timestamp, msg_type)
-                        if gps_info:
-                            if gps_info.get('altitude') is not None:
-                                altitude_data.append(gps_info)
-                            gps_data.append(gps_info)
-                    
-                    elif msg_type in ['POS', 'LOCAL_POSITION_NED']:
-                        pos_info = self._extract_position_data(msg, timestamp, msg_type)
-                        if pos_info:
-                            altitude_data.append(pos_info)
-                    
-                    elif msg_type in ['CTUN', 'NTUN']:
-                        if hasattr(msg, 'Alt'):
-                            altitude_data.append({
-                                'timestamp': timestamp,
-                                'latitude': None,
-                                'longitude': None,
-                                'absolute_alt': msg.Alt,
-                                'relative_alt': msg.Alt,
-                                'altitude': msg.Alt,
-                                'altitude_source': msg_type
-                            })
-                    
-                    elif msg_type in ['BAT', 'BATTERY_STATUS', 'CURR', 'POWR']:
-                        battery_info = self._extract_battery_data(msg, timestamp, msg_type)
-                        if battery_info:
-                            battery_data.append(battery_info)
-                    
-                    elif msg_type in ['RCIN', 'RC_CHANNELS', 'RC_CHANNELS_RAW', 'RCOU']:
-                        rc_info = self._extract_rc_data(msg, timestamp, msg_type)
-                        if rc_info:
-                            rc_data.append(rc_info)
-                    
-                    elif msg_type in ['ATT', 'ATTITUDE', 'AHR2', 'AHR3']:
-                        attitude_info = self._extract_attitude_data(msg, timestamp, msg_type)
-                        if attitude_info:
-                            attitude_data.append(attitude_info)
-                    
-                    elif msg_type in ['MSG', 'STATUSTEXT', 'ERR']:
-                        error_info = self._extract_message_data(msg, timestamp, msg_type)
-                        if error_info and error_info['severity'] <= 4:  # Include warnings and above
-                            parsed_data["errors"].append(error_info)
-                    
-                    elif msg_type == 'MODE':
-                        if hasattr(msg, 'Mode'):
-                            modes.append({
-                                'timestamp': timestamp,
-                                'mode': msg.Mode,
-                                'mode_num': msg.ModeNum if hasattr(msg, 'ModeNum') else 0
-                            })
-                            
-                            # Fallback vehicle type detection from mode (for DataFlash logs without HEARTBEAT)
-                            if parsed_data["vehicle_type"] == "Unknown":
-                                parsed_data["vehicle_type"] = self._determine_vehicle_type_from_mode(msg.Mode)
-                    
-                    # Process Extended Kalman Filter messages
-                    elif msg_type in ['XKFS', 'XKQ', 'XKV1', 'XKV2', 'XKT', 'XKFM', 'NKF1', 'NKF2', 'NKF3', 'NKF4', 'NKF5']:
-                        ekf_info = self._extract_ekf_data(msg, timestamp, msg_type)
-                        if ekf_info:
-                            # Store EKF data for analysis
-                            if 'ekf_data' not in parsed_data:
-                                parsed_data['ekf_data'] = []
-                            parsed_data['ekf_data'].append(ekf_info)
-                    
-                    # Process IMU messages (including legacy variants)
-                    elif msg_type in ['IMU', 'IMU2', 'IMU3', 'ACC', 'ACC2', 'ACC3', 'GYR', 'GYR2', 'GYR3']:
-                        imu_info = self._extract_imu_data(msg, timestamp, msg_type)
-                        if imu_info:
-                            if 'imu_data' not in parsed_data:
-                                parsed_data['imu_data'] = []
-                            parsed_data['imu_data'].append(imu_info)
-                    
-                    # Process barometer messages
-                    elif msg_type in ['BARO', 'BAR2', 'BAR3']:
-                        baro_info = self._extract_baro_data(msg, timestamp, msg_type)
-                        if baro_info:
-                            if 'baro_data' not in parsed_data:
-                                parsed_data['baro_data'] = []
-                            parsed_data['baro_data'].append(baro_info)
-                    
-                    # Process magnetometer messages
-                    elif msg_type in ['MAG', 'MAG2', 'MAG3']:
-                        mag_info = self._extract_mag_data(msg, timestamp, msg_type)
-                        if mag_info:
-                            if 'mag_data' not in parsed_data:
-                                parsed_data['mag_data'] = []
-                            parsed_data['mag_data'].append(mag_info)
-                    
-                    # Process performance monitoring
-                    elif msg_type == 'PM':
-                        pm_info = self._extract_performance_data(msg, timestamp, msg_type)
-                        if pm_info:
-                            if 'performance_data' not in parsed_data:
-                                parsed_data['performance_data'] = []
-                            parsed_data['performance_data'].append(pm_info)
-                    
-                    # Process vibration data
-                    elif msg_type in ['VIBE', 'VIBRATION']:
-                        vibe_info = self._extract_vibration_data(msg, timestamp, msg_type)
-                        if vibe_info:
-                            if 'vibration_data' not in parsed_data:
-                                parsed_data['vibration_data'] = []
-                            parsed_data['vibration_data'].append(vibe_info)
+                    # Extract specific data based on message type (unhandled types are only counted)
+                    if handler:
+                        handler(msg, timestamp, msg_type, fields, parsed_data, channels)
                     
                 except Exception as e:
                     logger.warning(f"Error parsing message {msg_type}: {e}")
@@ -260,22 +286,30 @@ class MAVLinkParser:
                 parsed_data["end_time"] = datetime.fromtimestamp(end_timestamp)
                 parsed_data["flight_duration"] = end_timestamp - start_timestamp
             
+            errors_dropped = parsed_data.pop("errors_dropped")
+            if errors_dropped:
+                logger.warning(f"Dropped {errors_dropped} older error messages (limit {MAX_ERRORS})")
+            parsed_data["errors"] = list(parsed_data["errors"])
+            parsed_data["message_counts"] = dict(message_counts)
+            parsed_data["messages_count"] = sum(message_counts.values())
+            for key, buffer in channels.items():
+                if len(buffer) or key not in OPTIONAL_CHANNELS:
+                    parsed_data[key] = buffer.columns()
+            parsed_data["altitude_data"] = self._select_altitude_source(parsed_data["altitude_data"])
+            
             # Analyze collected data
-            parsed_data["flight_stats"] = await self._analyze_flight_data(
-                altitude_data, battery_data, gps_data, rc_data, attitude_data, system_status
+            parsed_data["flight_stats"] = self._analyze_flight_data(
+                parsed_data["altitude_data"],
+                parsed_data["battery_data"],
+                parsed_data["gps_data"],
+                parsed_data["rc_data"],
+                parsed_data["attitude_data"],
+                parsed_data["system_status"]
             )
+            if errors_dropped:
+                parsed_data["flight_stats"]["errors_dropped"] = errors_dropped
             
-            parsed_data["message_counts"] = message_counts
-            parsed_data["altitude_data"] = altitude_data
-            parsed_data["battery_data"] = battery_data
-            parsed_data["gps_data"] = gps_data
-            parsed_data["rc_data"] = rc_data
-            parsed_data["attitude_data"] = attitude_data
-            parsed_data["modes"] = modes
-            parsed_data["heartbeat_data"] = heartbeat_data
-            parsed_data["system_status"] = system_status
-            
-            logger.info(f"Parsed {sum(message_counts.values())} messages from {len(message_counts)} message types")
+            logger.info(f"Parsed {parsed_data['messages_count']} messages from {len(message_counts)} message types")
             logger.info(f"Vehicle Type: {parsed_data['vehicle_type']}")
             logger.info(f"Autopilot: {parsed_data['autopilot_type']}")
             logger.info(f"Flight duration: {parsed_data.get('flight_duration', 0):.1f} seconds")
@@ -286,249 +320,294 @@ class MAVLinkParser:
             logger.error(f"Error parsing MAVLink file: {e}")
             raise
 
-    def _extract_gps_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract GPS data from various GPS message types"""
+    def _handle_heartbeat(self, msg, timestamp, msg_type, fields, parsed_data, channels):
+        """Record a HEARTBEAT and identify the vehicle (MAVLink standard)"""
+        channels["heartbeat_data"].append((
+            timestamp, msg.type, msg.autopilot, msg.base_mode,
+            msg.custom_mode, msg.system_status, msg.mavlink_version
+        ))
+        
+        # Determine vehicle type from HEARTBEAT message
+        if parsed_data["vehicle_type"] == "Unknown":
+            vehicle_type_id = msg.type
+            parsed_data["vehicle_type"] = self.mav_vehicle_types.get(vehicle_type_id, f"Unknown Type {vehicle_type_id}")
+            
+        # Determine autopilot type
+        if parsed_data["autopilot_type"] == "Unknown":
+            autopilot_id = msg.autopilot
+            parsed_data["autopilot_type"] = self.mav_autopilot_types.get(autopilot_id, f"Unknown Autopilot {autopilot_id}")
+
+    def _handle_sys_status(self, msg, timestamp, msg_type, fields, parsed_data, channels):
+        """Record a SYS_STATUS message for system health"""
+        channels["system_status"].append((
+            timestamp,
+            msg.onboard_control_sensors_present,
+            msg.onboard_control_sensors_enabled,
+            msg.onboard_control_sensors_health,
+            msg.load,
+            msg.voltage_battery,
+            msg.current_battery,
+            msg.battery_remaining,
+            msg.drop_rate_comm
+        ))
+
+    def _handle_gps(self, msg, timestamp, msg_type, fields, parsed_data, channels):
+        """Record a GPS fix, and its altitude when present"""
+        gps_row = self._extract_gps_data(msg, timestamp, msg_type, fields)
+        if gps_row:
+            channels["gps_data"].append(gps_row)
+            if gps_row[4] is not None:  # absolute_alt
+                channels["altitude_data"].append(gps_row[:GPS_ALTITUDE_FIELDS])
+
+    def _handle_text_message(self, msg, timestamp, msg_type, fields, parsed_data, channels):
+        """Record status text and error messages of warning severity and above"""
+        error_info = self._extract_message_data(msg, timestamp, msg_type, fields)
+        if error_info and error_info['severity'] <= MAX_ERROR_SEVERITY:
+            errors = parsed_data["errors"]
+            if len(errors) == errors.maxlen:
+                parsed_data["errors_dropped"] += 1
+            errors.append(error_info)
+
+    def _handle_mode(self, msg, timestamp, msg_type, fields, parsed_data, channels):
+        """Record a flight mode change"""
+        if 'Mode' in fields:
+            parsed_data["modes"].append({
+                'timestamp': timestamp,
+                'mode': msg.Mode,
+                'mode_num': msg.ModeNum if 'ModeNum' in fields else 0
+            })
+            
+            # Fallback vehicle type detection from mode (for DataFlash logs without HEARTBEAT)
+            if parsed_data["vehicle_type"] == "Unknown":
+                parsed_data["vehicle_type"] = self._determine_vehicle_type_from_mode(msg.Mode)
+
+    def _extract_gps_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract a GPS_FIELDS row from various GPS message types"""
         try:
-            gps_info = {'timestamp': timestamp, 'message_type': msg_type}
+            code = GPS_TYPE_CODES[msg_type]
             
-            if msg_type in ['GPS', 'GPS2']:
+            if msg_type in ('GPS', 'GPS2'):
                 # ArduPilot DataFlash GPS message
-                if hasattr(msg, 'Alt') and hasattr(msg, 'Lat') and hasattr(msg, 'Lng'):
-                    gps_info.update({
-                        'latitude': msg.Lat,
-                        'longitude': msg.Lng,
-                        'absolute_alt': msg.Alt,
-                        'relative_alt': msg.RelAlt if hasattr(msg, 'RelAlt') else msg.Alt,
-                        'altitude': msg.Alt,
-                        'lat': msg.Lat,
-                        'lon': msg.Lng,
-                        'fix_type': msg.Status if hasattr(msg, 'Status') else 3,
-                        'satellites': msg.NSats if hasattr(msg, 'NSats') else 0,
-                        'hdop': msg.HDop if hasattr(msg, 'HDop') else None,
-                        'vdop': msg.VDop if hasattr(msg, 'VDop') else None,
-                        'ground_speed': msg.Spd if hasattr(msg, 'Spd') else None,
-                        'ground_course': msg.GCrs if hasattr(msg, 'GCrs') else None
-                    })
-                    return gps_info
+                if 'Alt' in fields and 'Lat' in fields and 'Lng' in fields:
+                    lat, lng, alt = DATAFLASH_GPS_GETTER(msg)
+                    return (
+                        timestamp, code, lat, lng,
+                        alt,
+                        msg.RelAlt if 'RelAlt' in fields else alt,
+                        msg.Status if 'Status' in fields else 3,
+                        msg.NSats if 'NSats' in fields else 0,
+                        msg.HDop if 'HDop' in fields else None,
+                        msg.VDop if 'VDop' in fields else None,
+                        msg.Spd if 'Spd' in fields else None,
+                        msg.GCrs if 'GCrs' in fields else None,
+                        None, None
+                    )
             
             elif msg_type == 'GPA':
-                # GPS accuracy message
-                if hasattr(msg, 'VDop') or hasattr(msg, 'HDop'):
-                    gps_info.update({
-                        'hdop': msg.HDop if hasattr(msg, 'HDop') else None,
-                        'vdop': msg.VDop if hasattr(msg, 'VDop') else None,
-                        'satellites': msg.SAcc if hasattr(msg, 'SAcc') else None,
-                        'message_subtype': 'accuracy'
-                    })
-                    return gps_info
+                # GPS accuracy message, only kept when it carries dilution of precision
+                if 'VDop' in fields or 'HDop' in fields:
+                    return (
+                        timestamp, code, None, None, None, None, None,
+                        msg.SAcc if 'SAcc' in fields else None,
+                        msg.HDop if 'HDop' in fields else None,
+                        msg.VDop if 'VDop' in fields else None,
+                        None, None, None, None
+                    )
                     
             elif msg_type == 'GPS_RAW_INT':
                 # MAVLink GPS_RAW_INT message
-                gps_info.update({
-                    'latitude': msg.lat / 1e7,
-                    'longitude': msg.lon / 1e7,
-                    'absolute_alt': msg.alt / 1000.0,  # Convert mm to m
-                    'altitude': msg.alt / 1000.0,
-                    'fix_type': msg.fix_type,
-                    'satellites': msg.satellites_visible,
-                    'hdop': msg.eph / 100.0 if msg.eph != 65535 else None,
-                    'vdop': msg.epv / 100.0 if msg.epv != 65535 else None,
-                    'ground_speed': msg.vel / 100.0 if msg.vel != 65535 else None,
-                    'ground_course': msg.cog / 100.0 if msg.cog != 65535 else None
-                })
-                return gps_info
+                lat, lon, alt, fix_type, satellites, eph, epv, vel, cog = GPS_RAW_INT_GETTER(msg)
+                return (
+                    timestamp, code, lat / 1e7, lon / 1e7,
+                    alt / 1000.0,  # Convert mm to m
+                    None,
+                    fix_type,
+                    satellites,
+                    eph / 100.0 if eph != 65535 else None,
+                    epv / 100.0 if epv != 65535 else None,
+                    vel / 100.0 if vel != 65535 else None,
+                    cog / 100.0 if cog != 65535 else None,
+                    None, None
+                )
                 
             elif msg_type == 'GLOBAL_POSITION_INT':
                 # MAVLink GLOBAL_POSITION_INT message
-                gps_info.update({
-                    'latitude': msg.lat / 1e7,
-                    'longitude': msg.lon / 1e7,
-                    'absolute_alt': msg.alt / 1000.0,
-                    'relative_alt': msg.relative_alt / 1000.0,
-                    'altitude': msg.alt / 1000.0,
-                    'ground_speed': np.sqrt(msg.vx**2 + msg.vy**2) / 100.0,
-                    'vertical_speed': msg.vz / 100.0,
-                    'heading': msg.hdg / 100.0 if msg.hdg != 65535 else None
-                })
-                return gps_info
+                lat, lon, alt, relative_alt, vx, vy, vz, hdg = GLOBAL_POSITION_INT_GETTER(msg)
+                return (
+                    timestamp, code, lat / 1e7, lon / 1e7,
+                    alt / 1000.0,
+                    relative_alt / 1000.0,
+                    None, None, None, None,
+                    math.hypot(vx, vy) / 100.0,
+                    None,
+                    vz / 100.0,
+                    hdg / 100.0 if hdg != 65535 else None
+                )
                 
         except Exception as e:
             logger.warning(f"Error extracting GPS data from {msg_type}: {e}")
         
         return None
 
-    def _extract_position_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract position data from position messages"""
+    def _extract_position_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract an ALTITUDE_FIELDS row from position and tuning messages"""
         try:
-            if msg_type == 'POS' and hasattr(msg, 'Alt'):
-                return {
-                    'timestamp': timestamp,
-                    'latitude': msg.Lat if hasattr(msg, 'Lat') else None,
-                    'longitude': msg.Lng if hasattr(msg, 'Lng') else None,
-                    'absolute_alt': msg.Alt,
-                    'relative_alt': msg.RelAlt if hasattr(msg, 'RelAlt') else msg.Alt,
-                    'altitude': msg.Alt,
-                    'altitude_source': 'POS'
-                }
+            code = ALTITUDE_TYPE_CODES[msg_type]
+            
+            if msg_type == 'POS' and 'Alt' in fields:
+                return (
+                    timestamp, code,
+                    msg.Lat if 'Lat' in fields else None,
+                    msg.Lng if 'Lng' in fields else None,
+                    msg.Alt,
+                    msg.RelAlt if 'RelAlt' in fields else msg.Alt
+                )
             elif msg_type == 'LOCAL_POSITION_NED':
-                return {
-                    'timestamp': timestamp,
-                    'latitude': None,
-                    'longitude': None,
-                    'absolute_alt': -msg.z,  # NED frame, z is down
-                    'relative_alt': -msg.z,
-                    'altitude': -msg.z,
-                    'altitude_source': 'LOCAL_POSITION_NED',
-                    'x': msg.x,
-                    'y': msg.y,
-                    'z': msg.z,
-                    'vx': msg.vx,
-                    'vy': msg.vy,
-                    'vz': msg.vz
-                }
+                # NED frame, z is down
+                return (timestamp, code, None, None, -msg.z, -msg.z)
+            elif msg_type in ['CTUN', 'NTUN'] and 'Alt' in fields:
+                return (timestamp, code, None, None, msg.Alt, msg.Alt)
         except Exception as e:
             logger.warning(f"Error extracting position data from {msg_type}: {e}")
         
         return None
 
-    def _extract_battery_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract battery data from various battery message types"""
+    def _extract_battery_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract a BATTERY_FIELDS row from various battery message types"""
         try:
-            if msg_type == 'BAT' and hasattr(msg, 'Volt'):
-                return {
-                    'timestamp': timestamp,
-                    'voltage': msg.Volt,
-                    'current': msg.Curr if hasattr(msg, 'Curr') else None,
-                    'remaining': msg.CurrTot if hasattr(msg, 'CurrTot') else None,
-                    'temperature': msg.Temp if hasattr(msg, 'Temp') else None,
-                    'message_type': msg_type
-                }
-            elif msg_type == 'CURR' and hasattr(msg, 'Volt'):
-                return {
-                    'timestamp': timestamp,
-                    'voltage': msg.Volt,
-                    'current': msg.Curr if hasattr(msg, 'Curr') else None,
-                    'current_total': msg.CurrTot if hasattr(msg, 'CurrTot') else None,
-                    'message_type': msg_type
-                }
-            elif msg_type == 'POWR' and hasattr(msg, 'Vcc'):
-                return {
-                    'timestamp': timestamp,
-                    'voltage': msg.Vcc / 1000.0 if hasattr(msg, 'Vcc') else None,  # Convert mV to V
-                    'voltage_servo': msg.VServo / 1000.0 if hasattr(msg, 'VServo') else None,
-                    'flags': msg.Flags if hasattr(msg, 'Flags') else None,
-                    'message_type': msg_type
-                }
+            code = BATTERY_TYPE_CODES[msg_type]
+            
+            if msg_type == 'BAT' and 'Volt' in fields:
+                return (
+                    timestamp, code, msg.Volt,
+                    msg.Curr if 'Curr' in fields else None,
+                    msg.CurrTot if 'CurrTot' in fields else None,
+                    None,
+                    msg.Temp if 'Temp' in fields else None,
+                    None, None, None, None
+                )
+            elif msg_type == 'CURR' and 'Volt' in fields:
+                return (
+                    timestamp, code, msg.Volt,
+                    msg.Curr if 'Curr' in fields else None,
+                    None,
+                    msg.CurrTot if 'CurrTot' in fields else None,
+                    None, None, None, None, None
+                )
+            elif msg_type == 'POWR' and 'Vcc' in fields:
+                return (
+                    timestamp, code,
+                    msg.Vcc / 1000.0,  # Convert mV to V
+                    None, None, None, None,
+                    msg.VServo / 1000.0 if 'VServo' in fields else None,
+                    msg.Flags if 'Flags' in fields else None,
+                    None, None
+                )
             elif msg_type == 'BATTERY_STATUS':
-                return {
-                    'timestamp': timestamp,
-                    'voltage': sum(msg.voltages[:msg.voltages_ext]) / 1000.0 if msg.voltages else None,
-                    'current': msg.current_battery / 100.0 if msg.current_battery != -1 else None,
-                    'remaining': msg.battery_remaining if msg.battery_remaining != -1 else None,
-                    'temperature': msg.temperature / 100.0 if msg.temperature != INT16_MAX else None,
-                    'battery_function': msg.battery_function,
-                    'battery_type': msg.type,
-                    'message_type': msg_type
-                }
+                return (
+                    timestamp, code,
+                    sum(msg.voltages[:msg.voltages_ext]) / 1000.0 if msg.voltages else None,
+                    msg.current_battery / 100.0 if msg.current_battery != -1 else None,
+                    msg.battery_remaining if msg.battery_remaining != -1 else None,
+                    None,
+                    msg.temperature / 100.0 if msg.temperature != INT16_MAX else None,
+                    None, None,
+                    msg.battery_function,
+                    msg.type
+                )
         except Exception as e:
             logger.warning(f"Error extracting battery data from {msg_type}: {e}")
         
         return None
 
-    def _extract_rc_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract RC data from various RC message types"""
+    def _extract_rc_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract an RC_FIELDS row from various RC message types"""
         try:
-            rc_info = {'timestamp': timestamp, 'message_type': msg_type}
-            
-            if msg_type == 'RCIN' and hasattr(msg, 'C1'):
-                rc_info.update({
-                    'chan1': msg.C1,
-                    'chan2': msg.C2 if hasattr(msg, 'C2') else 0,
-                    'chan3': msg.C3 if hasattr(msg, 'C3') else 0,
-                    'chan4': msg.C4 if hasattr(msg, 'C4') else 0,
-                    'chan5': msg.C5 if hasattr(msg, 'C5') else 0,
-                    'chan6': msg.C6 if hasattr(msg, 'C6') else 0,
-                    'chan7': msg.C7 if hasattr(msg, 'C7') else 0,
-                    'chan8': msg.C8 if hasattr(msg, 'C8') else 0,
-                    'rssi': 255  # Default value for DataFlash logs
-                })
-                return rc_info
-            
-            elif msg_type == 'RCOU' and hasattr(msg, 'C1'):
-                rc_info.update({
-                    'chan1_out': msg.C1,
-                    'chan2_out': msg.C2 if hasattr(msg, 'C2') else 0,
-                    'chan3_out': msg.C3 if hasattr(msg, 'C3') else 0,
-                    'chan4_out': msg.C4 if hasattr(msg, 'C4') else 0,
-                    'chan5_out': msg.C5 if hasattr(msg, 'C5') else 0,
-                    'chan6_out': msg.C6 if hasattr(msg, 'C6') else 0,
-                    'chan7_out': msg.C7 if hasattr(msg, 'C7') else 0,
-                    'chan8_out': msg.C8 if hasattr(msg, 'C8') else 0,
-                    'output_type': 'servo'
-                })
-                return rc_info
+            code = RC_TYPE_CODES[msg_type]
+            
+            if msg_type == 'RCIN' and 'C1' in fields:
+                return (
+                    timestamp, code,
+                    msg.C1,
+                    msg.C2 if 'C2' in fields else 0,
+                    msg.C3 if 'C3' in fields else 0,
+                    msg.C4 if 'C4' in fields else 0,
+                    msg.C5 if 'C5' in fields else 0,
+                    msg.C6 if 'C6' in fields else 0,
+                    msg.C7 if 'C7' in fields else 0,
+                    msg.C8 if 'C8' in fields else 0,
+                    255,  # Default RSSI for DataFlash logs
+                    None, None, None, None, None, None, None, None
+                )
+            
+            elif msg_type == 'RCOU' and 'C1' in fields:
+                # Servo outputs
+                return (
+                    timestamp, code,
+                    None, None, None, None, None, None, None, None, None,
+                    msg.C1,
+                    msg.C2 if 'C2' in fields else 0,
+                    msg.C3 if 'C3' in fields else 0,
+                    msg.C4 if 'C4' in fields else 0,
+                    msg.C5 if 'C5' in fields else 0,
+                    msg.C6 if 'C6' in fields else 0,
+                    msg.C7 if 'C7' in fields else 0,
+                    msg.C8 if 'C8' in fields else 0
+                )
                 
             elif msg_type in ['RC_CHANNELS', 'RC_CHANNELS_RAW']:
-                rc_info.update({
-                    'chan1': msg.chan1_raw,
-                    'chan2': msg.chan2_raw,
-                    'chan3': msg.chan3_raw,
-                    'chan4': msg.chan4_raw,
-                    'chan5': msg.chan5_raw if hasattr(msg, 'chan5_raw') else 0,
-                    'chan6': msg.chan6_raw if hasattr(msg, 'chan6_raw') else 0,
-                    'chan7': msg.chan7_raw if hasattr(msg, 'chan7_raw') else 0,
-                    'chan8': msg.chan8_raw if hasattr(msg, 'chan8_raw') else 0,
-                    'rssi': msg.rssi if hasattr(msg, 'rssi') else 255
-                })
-                return rc_info
+                return (
+                    timestamp, code,
+                    msg.chan1_raw,
+                    msg.chan2_raw,
+                    msg.chan3_raw,
+                    msg.chan4_raw,
+                    msg.chan5_raw if 'chan5_raw' in fields else 0,
+                    msg.chan6_raw if 'chan6_raw' in fields else 0,
+                    msg.chan7_raw if 'chan7_raw' in fields else 0,
+                    msg.chan8_raw if 'chan8_raw' in fields else 0,
+                    msg.rssi if 'rssi' in fields else 255,
+                    None, None, None, None, None, None, None, None
+                )
                 
         except Exception as e:
             logger.warning(f"Error extracting RC data from {msg_type}: {e}")
         
         return None
 
-    def _extract_attitude_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract attitude data from attitude messages"""
+    def _extract_attitude_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract an ATTITUDE_FIELDS row from attitude messages"""
         try:
-            if msg_type == 'ATT' and hasattr(msg, 'Roll'):
-                return {
-                    'timestamp': timestamp,
-                    'roll': msg.Roll,
-                    'pitch': msg.Pitch,
-                    'yaw': msg.Yaw,
-                    'message_type': msg_type
-                }
-            elif msg_type in ['AHR2', 'AHR3'] and hasattr(msg, 'Roll'):
-                return {
-                    'timestamp': timestamp,
-                    'roll': msg.Roll,
-                    'pitch': msg.Pitch,
-                    'yaw': msg.Yaw,
-                    'altitude': msg.Alt if hasattr(msg, 'Alt') else None,
-                    'latitude': msg.Lat if hasattr(msg, 'Lat') else None,
-                    'longitude': msg.Lng if hasattr(msg, 'Lng') else None,
-                    'message_type': msg_type
-                }
+            code = ATTITUDE_TYPE_CODES[msg_type]
+            
+            if msg_type == 'ATT' and 'Roll' in fields:
+                return (
+                    timestamp, code, msg.Roll, msg.Pitch, msg.Yaw,
+                    None, None, None, None, None, None
+                )
+            elif msg_type in ['AHR2', 'AHR3'] and 'Roll' in fields:
+                return (
+                    timestamp, code, msg.Roll, msg.Pitch, msg.Yaw,
+                    None, None, None,
+                    msg.Alt if 'Alt' in fields else None,
+                    msg.Lat if 'Lat' in fields else None,
+                    msg.Lng if 'Lng' in fields else None
+                )
             elif msg_type == 'ATTITUDE':
-                return {
-                    'timestamp': timestamp,
-                    'roll': msg.roll,
-                    'pitch': msg.pitch,
-                    'yaw': msg.yaw,
-                    'rollspeed': msg.rollspeed,
-                    'pitchspeed': msg.pitchspeed,
-                    'yawspeed': msg.yawspeed,
-                    'message_type': msg_type
-                }
+                return (
+                    timestamp, code, msg.roll, msg.pitch, msg.yaw,
+                    msg.rollspeed, msg.pitchspeed, msg.yawspeed,
+                    None, None, None
+                )
         except Exception as e:
             logger.warning(f"Error extracting attitude data from {msg_type}: {e}")
         
         return None
 
-    def _extract_message_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
+    def _extract_message_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Dict[str, Any]]:
         """Extract message/status text data"""
         try:
-            if msg_type == 'MSG' and hasattr(msg, 'Message'):
+            if msg_type == 'MSG' and 'Message' in fields:
                 message_text = msg.Message
                 severity = self._determine_message_severity(message_text)
                 return {
@@ -537,7 +616,7 @@ class MAVLinkParser:
                     'text': message_text,
                     'message_type': msg_type
                 }
-            elif msg_type == 'ERR' and hasattr(msg, 'Subsys'):
+            elif msg_type == 'ERR' and 'Subsys' in fields:
                 # Error message with subsystem and error code
                 error_text = f"Subsystem {msg.Subsys}: Error {msg.ECode}"
                 return {
@@ -549,6 +628,9 @@ class MAVLinkParser:
                     'message_type': msg_type
                 }
             elif msg_type == 'STATUSTEXT':
+                # Only decode text that will be kept
+                if msg.severity > MAX_ERROR_SEVERITY:
+                    return None
                 return {
                     'timestamp': timestamp,
                     'severity': msg.severity,
@@ -562,11 +644,8 @@ class MAVLinkParser:
 
     def _determine_message_severity(self, message_text: str) -> int:
         """Determine message severity based on content"""
-        message_lower = message_text.lower()
-        
-        # Use imported severity keywords
-        for severity, keywords in SEVERITY_KEYWORDS.items():
-            if any(word in message_lower for word in keywords):
+        for severity, pattern in SEVERITY_PATTERNS:
+            if pattern.search(message_text):
                 return severity
         
         # Default to INFO level
@@ -574,97 +653,92 @@ class MAVLinkParser:
 
     def _determine_vehicle_type_from_mode(self, mode: str) -> str:
         """Determine vehicle type from flight mode (fallback method)"""
-        # Use imported mode lists
-        if mode in MULTICOPTER_MODES:
-            return "Quadrotor"
-        elif mode in FIXED_WING_MODES:
-            return "Fixed Wing"
-        elif mode in ROVER_MODES:
-            return "Ground Rover"
-        elif mode in HELICOPTER_MODES:
-            return "Helicopter"
-        
-        return "Unknown"
+        return MODE_VEHICLE_TYPES.get(mode, "Unknown")
 
-    async def _analyze_flight_data(self, altitude_data, battery_data, gps_data, rc_data, attitude_data, system_status) -> Dict[str, Any]:
+    def _analyze_flight_data(self, altitude_data, battery_data, gps_data, rc_data, attitude_data, system_status) -> Dict[str, Any]:
         """Analyze parsed flight data to extract key metrics"""
         stats = {}
         
         # Altitude analysis
-        if altitude_data:
-            altitudes = [d.get('relative_alt') for d in altitude_data if d.get('relative_alt') is not None]
-            if altitudes:
-                stats['max_altitude'] = max(altitudes)
-                stats['min_altitude'] = min(altitudes)
-                stats['avg_altitude'] = np.mean(altitudes)
-                stats['altitude_variance'] = np.var(altitudes)
+        altitudes = channel_values(altitude_data, 'relative_alt')
+        if altitudes.size:
+            (stats['min_altitude'], stats['max_altitude'],
+             stats['avg_altitude'], stats['altitude_variance']) = describe(altitudes)
         
         # Battery analysis
-        if battery_data:
-            voltages = [d.get('voltage') for d in battery_data if d.get('voltage') is not None]
-            currents = [d.get('current') for d in battery_data if d.get('current') is not None]
-            temperatures = [d.get('temperature') for d in battery_data if d.get('temperature') is not None]
-            
-            if voltages:
-                stats['max_battery_voltage'] = max(voltages)
-                stats['min_battery_voltage'] = min(voltages)
-                stats['avg_battery_voltage'] = np.mean(voltages)
-                stats['battery_voltage_drop'] = max(voltages) - min(voltages)
+        if channel_length(battery_data):
+            voltages = channel_values(battery_data, 'voltage')
+            current_column = channel_column(battery_data, 'current')
+            current_present = ~np.isnan(current_column)
+            currents = current_column[current_present]
+            temperatures = channel_values(battery_data, 'temperature')
+            
+            if voltages.size:
+                min_voltage, max_voltage, avg_voltage, _ = describe(voltages)
+                stats['max_battery_voltage'] = max_voltage
+                stats['min_battery_voltage'] = min_voltage
+                stats['avg_battery_voltage'] = avg_voltage
+                stats['battery_voltage_drop'] = max_voltage - min_voltage
                 
-            if currents:
-                stats['max_current'] = max(currents)
-                stats['avg_current'] = np.mean(currents)
-                stats['total_current_consumed'] = np.trapz(currents) if len(currents) > 1 else 0
+            if currents.size:
+                _, stats['max_current'], stats['avg_current'], _ = describe(currents)
+                # Trapezoidal integral of current (A) over the sample times (s), in mAh
+                times = channel_column(battery_data, 'timestamp')[current_present]
+                stats['total_current_consumed'] = (
+                    float(np.dot(0.5 * (currents[:-1] + currents[1:]), np.diff(times)) / 3.6)
+                    if currents.size > 1 else 0
+                )
                 
-            if temperatures:
-                stats['max_battery_temp'] = max(temperatures)
-                stats['min_battery_temp'] = min(temperatures)
+            if temperatures.size:
+                stats['max_battery_temp'] = float(temperatures.max())
+                stats['min_battery_temp'] = float(temperatures.min())
         
         # GPS analysis
-        if gps_data:
-            gps_losses = [d for d in gps_data if d.get('fix_type', 0) < 3]  # No 3D fix
-            stats['gps_loss_events'] = len(gps_losses)
-            if gps_losses:
-                stats['first_gps_loss'] = min(d.get('timestamp', 0) for d in gps_losses)
+        if channel_length(gps_data):
+            # Rows without a fix type (accuracy/position-only messages) count as no fix
+            fix_types = np.nan_to_num(channel_column(gps_data, 'fix_type'), nan=0)
+            gps_losses = fix_types < 3  # No 3D fix
+            stats['gps_loss_events'] = int(np.count_nonzero(gps_losses))
+            if stats['gps_loss_events']:
+                stats['first_gps_loss'] = float(channel_column(gps_data, 'timestamp')[gps_losses].min())
             
             # GPS quality metrics
-            satellites = [d.get('satellites', 0) for d in gps_data if d.get('satellites') is not None]
-            if satellites:
-                stats['avg_satellites'] = np.mean(satellites)
-                stats['min_satellites'] = min(satellites)
-            
-            hdops = [d.get('hdop') for d in gps_data if d.get('hdop') is not None]
-            if hdops:
-                stats['avg_hdop'] = np.mean(hdops)
-                stats['max_hdop'] = max(hdops)
+            satellites = channel_values(gps_data, 'satellites')
+            if satellites.size:
+                stats['avg_satellites'] = float(satellites.mean())
+                stats['min_satellites'] = float(satellites.min())
+            
+            hdops = channel_values(gps_data, 'hdop')
+            if hdops.size:
+                stats['avg_hdop'] = float(hdops.mean())
+                stats['max_hdop'] = float(hdops.max())
         
         # RC analysis
-        if rc_data:
-            rc_losses = [d for d in rc_data if d.get('rssi', 255) < 50]  # Weak signal
-            stats['rc_loss_events'] = len(rc_losses)
-            if rc_losses:
-                stats['first_rc_loss'] = min(d.get('timestamp', 0) for d in rc_losses)
+        if channel_length(rc_data):
+            # Rows without RSSI (servo outputs) are treated as full signal
+            rssi = np.nan_to_num(channel_column(rc_data, 'rssi'), nan=255)
+            rc_losses = rssi < 50  # Weak signal
+            stats['rc_loss_events'] = int(np.count_nonzero(rc_losses))
+            if stats['rc_loss_events']:
+                stats['first_rc_loss'] = float(channel_column(rc_data, 'timestamp')[rc_losses].min())
         
-        # Attitude analysis
-        if attitude_data:
-            rolls = [d.get('roll', 0) for d in attitude_data]
-            pitches = [d.get('pitch', 0) for d in attitude_data]
-            
-            if rolls:
-                stats['max_roll'] = max(abs(r) for r in rolls)
-            if pitches:
-                stats['max_pitch'] = max(abs(p) for p in pitches)
+        # Attitude analysis (largest magnitude from the extremes, without an abs() copy)
+        rolls = channel_values(attitude_data, 'roll')
+        if rolls.size:
+            stats['max_roll'] = float(max(rolls.max(), -rolls.min()))
+        pitches = channel_values(attitude_data, 'pitch')
+        if pitches.size:
+            stats['max_pitch'] = float(max(pitches.max(), -pitches.min()))
         
         # System status analysis
-        if system_status:
-            loads = [d.get('load', 0) for d in system_status]
-            if loads:
-                stats['max_cpu_load'] = max(loads) / 10.0  # Convert to percentage
-                stats['avg_cpu_load'] = np.mean(loads) / 10.0
+        loads = channel_values(system_status, 'load')
+        if loads.size:
+            stats['max_cpu_load'] = float(loads.max()) / 10.0  # Convert to percentage
+            stats['avg_cpu_load'] = float(loads.mean()) / 10.0
         
         return stats
 
-    async def generate_summary(self, flight_data: Dict[str, Any]) -> str:
+    def generate_summary(self, flight_data: Dict[str, Any]) -> str:
         """Generate a comprehensive flight summary"""
         try:
             stats = flight_data.get("flight_stats", {})
@@ -694,29 +768,37 @@ class MAVLinkParser:
                 summary_parts.append(f"Duration: {minutes}m {seconds}s")
             
             # Performance metrics
-            if stats.get("max_altitude"):
-                summary_parts.append(f"Max Alt: {stats['max_altitude']:.1f}m")
+            max_altitude = stats.get("max_altitude")
+            max_voltage = stats.get("max_battery_voltage")
+            min_voltage = stats.get("min_battery_voltage")
+            avg_satellites = stats.get("avg_satellites")
+            gps_loss_events = stats.get("gps_loss_events", 0)
+            rc_loss_events = stats.get("rc_loss_events", 0)
+            
+            if max_altitude:
+                summary_parts.append(f"Max Alt: {max_altitude:.1f}m")
             
-            if stats.get("max_battery_voltage") and stats.get("min_battery_voltage"):
-                summary_parts.append(f"Battery: {stats['min_battery_voltage']:.1f}V-{stats['max_battery_voltage']:.1f}V")
+            if max_voltage and min_voltage:
+                summary_parts.append(f"Battery: {min_voltage:.1f}V-{max_voltage:.1f}V")
             
-            if stats.get("avg_satellites"):
-                summary_parts.append(f"GPS Sats: {stats['avg_satellites']:.0f} avg")
+            if avg_satellites:
+                summary_parts.append(f"GPS Sats: {avg_satellites:.0f} avg")
             
-            # Issues and warnings
-            critical_errors = [e for e in errors if e.get('severity', 6) <= 2]
-            warnings = [e for e in errors if e.get('severity', 6) == 4]
+            # Issues and warnings, counted by severity in a single pass
+            severity_counts = Counter(e.get('severity', 6) for e in errors)
+            critical_count = sum(count for severity, count in severity_counts.items() if severity <= 2)
+            warning_count = severity_counts[4]
             
-            if critical_errors:
-                summary_parts.append(f"Critical: {len(critical_errors)} errors")
-            elif warnings:
-                summary_parts.append(f"Warnings: {len(warnings)}")
+            if critical_count:
+                summary_parts.append(f"Critical: {critical_count} errors")
+            elif warning_count:
+                summary_parts.append(f"Warnings: {warning_count}")
             
-            if stats.get("gps_loss_events", 0) > 0:
-                summary_parts.append(f"GPS Issues: {stats['gps_loss_events']} events")
+            if gps_loss_events > 0:
+                summary_parts.append(f"GPS Issues: {gps_loss_events} events")
             
-            if stats.get("rc_loss_events", 0) > 0:
-                summary_parts.append(f"RC Issues: {stats['rc_loss_events']} events")
+            if rc_loss_events > 0:
+                summary_parts.append(f"RC Issues: {rc_loss_events} events")
             
             return " | ".join(summary_parts)
             
@@ -724,166 +806,172 @@ class MAVLinkParser:
             logger.error(f"Error generating summary: {e}")
             return "Error generating flight summary"
 
-    def _extract_ekf_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract Extended Kalman Filter data from various EKF message types"""
+
+    def _extract_ekf_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract an EKF_FIELDS row from various EKF message types"""
         try:
-            ekf_info = {'timestamp': timestamp, 'message_type': msg_type}
+            code = EKF_TYPE_CODES[msg_type]
             
             if msg_type in ['XKFS', 'NKF1']:
                 # EKF status message
-                ekf_info.update({
-                    'roll_innovation': msg.RI if hasattr(msg, 'RI') else None,
-                    'pitch_innovation': msg.PI if hasattr(msg, 'PI') else None,
-                    'yaw_innovation': msg.YI if hasattr(msg, 'YI') else None,
-                    'velocity_variance': msg.VV if hasattr(msg, 'VV') else None,
-                    'position_variance': msg.PV if hasattr(msg, 'PV') else None,
-                    'height_variance': msg.HV if hasattr(msg, 'HV') else None,
-                    'mag_variance': msg.MV if hasattr(msg, 'MV') else None,
-                    'tas_ratio': msg.TR if hasattr(msg, 'TR') else None
-                })
-                return ekf_info
+                return (
+                    timestamp, code,
+                    msg.RI if 'RI' in fields else None,
+                    msg.PI if 'PI' in fields else None,
+                    msg.YI if 'YI' in fields else None,
+                    msg.VV if 'VV' in fields else None,
+                    msg.PV if 'PV' in fields else None,
+                    msg.HV if 'HV' in fields else None,
+                    msg.MV if 'MV' in fields else None,
+                    msg.TR if 'TR' in fields else None,
+                    None, None, None,
+                    None, None, None, None
+                )
                 
             elif msg_type in ['XKV1', 'XKV2']:
                 # EKF velocity message
-                ekf_info.update({
-                    'velocity_north': msg.VN if hasattr(msg, 'VN') else None,
-                    'velocity_east': msg.VE if hasattr(msg, 'VE') else None,
-                    'velocity_down': msg.VD if hasattr(msg, 'VD') else None
-                })
-                return ekf_info
+                return (
+                    timestamp, code,
+                    None, None, None, None, None, None, None, None,
+                    msg.VN if 'VN' in fields else None,
+                    msg.VE if 'VE' in fields else None,
+                    msg.VD if 'VD' in fields else None,
+                    None, None, None, None
+                )
                 
             elif msg_type == 'XKQ':
                 # EKF quaternion message
-                ekf_info.update({
-                    'q1': msg.Q1 if hasattr(msg, 'Q1') else None,
-                    'q2': msg.Q2 if hasattr(msg, 'Q2') else None,
-                    'q3': msg.Q3 if hasattr(msg, 'Q3') else None,
-                    'q4': msg.Q4 if hasattr(msg, 'Q4') else None
-                })
-                return ekf_info
+                return (
+                    timestamp, code,
+                    None, None, None, None, None, None, None, None,
+                    None, None, None,
+                    msg.Q1 if 'Q1' in fields else None,
+                    msg.Q2 if 'Q2' in fields else None,
+                    msg.Q3 if 'Q3' in fields else None,
+                    msg.Q4 if 'Q4' in fields else None
+                )
                 
         except Exception as e:
             logger.warning(f"Error extracting EKF data from {msg_type}: {e}")
         
         return None
     
-    def _extract_imu_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract IMU data from various IMU message types"""
+    def _extract_imu_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract an IMU_FIELDS row from various IMU message types"""
         try:
-            imu_info = {'timestamp': timestamp, 'message_type': msg_type}
+            code = IMU_TYPE_CODES[msg_type]
             
             if msg_type in ['IMU', 'IMU2', 'IMU3']:
-                imu_info.update({
-                    'gyro_x': msg.GyrX if hasattr(msg, 'GyrX') else None,
-                    'gyro_y': msg.GyrY if hasattr(msg, 'GyrY') else None,
-                    'gyro_z': msg.GyrZ if hasattr(msg, 'GyrZ') else None,
-                    'accel_x': msg.AccX if hasattr(msg, 'AccX') else None,
-                    'accel_y': msg.AccY if hasattr(msg, 'AccY') else None,
-                    'accel_z': msg.AccZ if hasattr(msg, 'AccZ') else None,
-                    'temperature': msg.T if hasattr(msg, 'T') else None
-                })
-                return imu_info
+                return (
+                    timestamp, code,
+                    msg.GyrX if 'GyrX' in fields else None,
+                    msg.GyrY if 'GyrY' in fields else None,
+                    msg.GyrZ if 'GyrZ' in fields else None,
+                    msg.AccX if 'AccX' in fields else None,
+                    msg.AccY if 'AccY' in fields else None,
+                    msg.AccZ if 'AccZ' in fields else None,
+                    msg.T if 'T' in fields else None
+                )
                 
             elif msg_type in ['ACC', 'ACC2', 'ACC3']:
-                imu_info.update({
-                    'accel_x': msg.AccX if hasattr(msg, 'AccX') else None,
-                    'accel_y': msg.AccY if hasattr(msg, 'AccY') else None,
-                    'accel_z': msg.AccZ if hasattr(msg, 'AccZ') else None,
-                    'sensor_type': 'accelerometer'
-                })
-                return imu_info
+                return (
+                    timestamp, code,
+                    None, None, None,
+                    msg.AccX if 'AccX' in fields else None,
+                    msg.AccY if 'AccY' in fields else None,
+                    msg.AccZ if 'AccZ' in fields else None,
+                    None
+                )
                 
             elif msg_type in ['GYR', 'GYR2', 'GYR3']:
-                imu_info.update({
-                    'gyro_x': msg.GyrX if hasattr(msg, 'GyrX') else None,
-                    'gyro_y': msg.GyrY if hasattr(msg, 'GyrY') else None,
-                    'gyro_z': msg.GyrZ if hasattr(msg, 'GyrZ') else None,
-                    'sensor_type': 'gyroscope'
-                })
-                return imu_info
+                return (
+                    timestamp, code,
+                    msg.GyrX if 'GyrX' in fields else None,
+                    msg.GyrY if 'GyrY' in fields else None,
+                    msg.GyrZ if 'GyrZ' in fields else None,
+                    None, None, None,
+                    None
+                )
                 
         except Exception as e:
             logger.warning(f"Error extracting IMU data from {msg_type}: {e}")
         
         return None
     
-    def _extract_baro_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract barometer data from barometer message types"""
+    def _extract_baro_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract a BARO_FIELDS row from barometer message types"""
         try:
-            return {
-                'timestamp': timestamp,
-                'pressure': msg.Press if hasattr(msg, 'Press') else None,
-                'altitude': msg.Alt if hasattr(msg, 'Alt') else None,
-                'temperature': msg.Temp if hasattr(msg, 'Temp') else None,
-                'climb_rate': msg.CRt if hasattr(msg, 'CRt') else None,
-                'message_type': msg_type
-            }
+            return (
+                timestamp, BARO_TYPE_CODES[msg_type],
+                msg.Press if 'Press' in fields else None,
+                msg.Alt if 'Alt' in fields else None,
+                msg.Temp if 'Temp' in fields else None,
+                msg.CRt if 'CRt' in fields else None
+            )
         except Exception as e:
             logger.warning(f"Error extracting barometer data from {msg_type}: {e}")
         
         return None
     
-    def _extract_mag_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract magnetometer data from magnetometer message types"""
+    def _extract_mag_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract a MAG_FIELDS row from magnetometer message types"""
         try:
-            return {
-                'timestamp': timestamp,
-                'mag_x': msg.MagX if hasattr(msg, 'MagX') else None,
-                'mag_y': msg.MagY if hasattr(msg, 'MagY') else None,
-                'mag_z': msg.MagZ if hasattr(msg, 'MagZ') else None,
-                'mag_field': msg.MagField if hasattr(msg, 'MagField') else None,
-                'offsets_x': msg.OfsX if hasattr(msg, 'OfsX') else None,
-                'offsets_y': msg.OfsY if hasattr(msg, 'OfsY') else None,
-                'offsets_z': msg.OfsZ if hasattr(msg, 'OfsZ') else None,
-                'message_type': msg_type
-            }
+            return (
+                timestamp, MAG_TYPE_CODES[msg_type],
+                msg.MagX if 'MagX' in fields else None,
+                msg.MagY if 'MagY' in fields else None,
+                msg.MagZ if 'MagZ' in fields else None,
+                msg.MagField if 'MagField' in fields else None,
+                msg.OfsX if 'OfsX' in fields else None,
+                msg.OfsY if 'OfsY' in fields else None,
+                msg.OfsZ if 'OfsZ' in fields else None
+            )
         except Exception as e:
             logger.warning(f"Error extracting magnetometer data from {msg_type}: {e}")
         
         return None
     
-    def _extract_performance_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract performance monitoring data"""
+    def _extract_performance_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract a PERFORMANCE_FIELDS row from performance monitoring messages"""
         try:
-            return {
-                'timestamp': timestamp,
-                'loop_time': msg.LTime if hasattr(msg, 'LTime') else None,
-                'main_loop_count': msg.MLC if hasattr(msg, 'MLC') else None,
-                'g_dt_max': msg.gDt if hasattr(msg, 'gDt') else None,
-                'g_dt_min': msg.gDtMin if hasattr(msg, 'gDtMin') else None,
-                'log_dropped': msg.LogDrop if hasattr(msg, 'LogDrop') else None,
-                'message_type': msg_type
-            }
+            return (
+                timestamp,
+                msg.LTime if 'LTime' in fields else None,
+                msg.MLC if 'MLC' in fields else None,
+                msg.gDt if 'gDt' in fields else None,
+                msg.gDtMin if 'gDtMin' in fields else None,
+                msg.LogDrop if 'LogDrop' in fields else None
+            )
         except Exception as e:
             logger.warning(f"Error extracting performance data from {msg_type}: {e}")
         
         return None
     
-    def _extract_vibration_data(self, msg, timestamp: float, msg_type: str) -> Optional[Dict[str, Any]]:
-        """Extract vibration data from vibration message types"""
+    def _extract_vibration_data(self, msg, timestamp: float, msg_type: str, fields: frozenset) -> Optional[Tuple]:
+        """Extract a VIBRATION_FIELDS row from vibration message types"""
         try:
+            code = VIBRATION_TYPE_CODES[msg_type]
+            
             if msg_type == 'VIBE':
-                return {
-                    'timestamp': timestamp,
-                    'vibe_x': msg.VibeX if hasattr(msg, 'VibeX') else None,
-                    'vibe_y': msg.VibeY if hasattr(msg, 'VibeY') else None,
-                    'vibe_z': msg.VibeZ if hasattr(msg, 'VibeZ') else None,
-                    'clipping_0': msg.Clip0 if hasattr(msg, 'Clip0') else None,
-                    'clipping_1': msg.Clip1 if hasattr(msg, 'Clip1') else None,
-                    'clipping_2': msg.Clip2 if hasattr(msg, 'Clip2') else None,
-                    'message_type': msg_type
-                }
+                return (
+                    timestamp, code,
+                    msg.VibeX if 'VibeX' in fields else None,
+                    msg.VibeY if 'VibeY' in fields else None,
+                    msg.VibeZ if 'VibeZ' in fields else None,
+                    msg.Clip0 if 'Clip0' in fields else None,
+                    msg.Clip1 if 'Clip1' in fields else None,
+                    msg.Clip2 if 'Clip2' in fields else None
+                )
             elif msg_type == 'VIBRATION':
-                return {
-                    'timestamp': timestamp,
-                    'vibration_x': msg.vibration_x,
-                    'vibration_y': msg.vibration_y,
-                    'vibration_z': msg.vibration_z,
-                    'clipping_0': msg.clipping_0,
-                    'clipping_1': msg.clipping_1,
-                    'clipping_2': msg.clipping_2,
-                    'message_type': msg_type
-                }
+                return (
+                    timestamp, code,
+                    msg.vibration_x,
+                    msg.vibration_y,
+                    msg.vibration_z,
+                    msg.clipping_0,
+                    msg.clipping_1,
+                    msg.clipping_2
+                )
         except Exception as e:
             logger.warning(f"Error extracting vibration data from {msg_type}: {e}")
         
@@ -7,7 +7,7 @@ based on the MAVLink common.xml specification.
 
 # reference: https://mavlink.io/en/messages/common.html
 
-from typing import Dict, List
+from typing import Dict, FrozenSet
 from enum import IntEnum
 
 class MAVType(IntEnum):
@@ -149,7 +149,8 @@ MAV_AUTOPILOT_TYPES: Dict[int, str] = {
 }
 
 # Expanded message types based on MAVLink common.xml specification
-SUPPORTED_MESSAGE_TYPES: List[str] = [
+# (a frozenset: membership tests are O(1) and repeated entries collapse)
+SUPPORTED_MESSAGE_TYPES: FrozenSet[str] = frozenset([
     # Core telemetry messages
     'HEARTBEAT', 'SYS_STATUS', 'SYSTEM_TIME', 'GPS_RAW_INT', 'GPS2_RAW',
     'SCALED_PRESSURE', 'ATTITUDE', 'ATTITUDE_QUATERNION', 'LOCAL_POSITION_NED',
@@ -274,35 +275,35 @@ SUPPORTED_MESSAGE_TYPES: List[str] = [
     'SIMSTATE', # Simulation state
     'WHEELENCODER', # Wheel encoder
     'ADSB_VEHICLE', # ADS-B vehicle
-]
+])
 
-# Flight mode mappings for different vehicle types
-MULTICOPTER_MODES = [
+# Flight mode mappings for different vehicle types (frozensets for O(1) membership tests)
+MULTICOPTER_MODES = frozenset({
     'STABILIZE', 'ACRO', 'ALT_HOLD', 'LOITER', 'AUTO', 'LAND', 'RTL', 
     'DRIFT', 'SPORT', 'FLIP', 'AUTOTUNE', 'POSHOLD', 'BRAKE', 'THROW', 
     'AVOID_ADSB', 'GUIDED_NOGPS', 'SMART_RTL', 'FLOWHOLD', 'FOLLOW', 
     'ZIGZAG', 'SYSTEMID', 'AUTOROTATE', 'AUTO_RTL'
-]
+})
 
-FIXED_WING_MODES = [
+FIXED_WING_MODES = frozenset({
     'MANUAL', 'CIRCLE', 'STABILIZE', 'TRAINING', 'ACRO', 'FLY_BY_WIRE_A', 
     'FLY_BY_WIRE_B', 'CRUISE', 'AUTOTUNE', 'AUTO', 'RTL', 'LOITER', 
     'TAKEOFF', 'AVOID_ADSB', 'GUIDED', 'INITIALISING', 'QSTABILIZE', 
     'QHOVER', 'QLOITER', 'QLAND', 'QRTL', 'QAUTOTUNE', 'QACRO', 'THERMAL'
-]
+})
 
-ROVER_MODES = [
+ROVER_MODES = frozenset({
     'MANUAL', 'ACRO', 'LEARNING', 'STEERING', 'HOLD', 'LOITER', 
     'FOLLOW', 'SIMPLE', 'AUTO', 'RTL', 'SMART_RTL', 'GUIDED', 'INITIALISING'
-]
+})
 
-HELICOPTER_MODES = [
+HELICOPTER_MODES = frozenset({
     'STABILIZE', 'ACRO', 'ALT_HOLD', 'AUTO', 'GUIDED', 'LOITER', 
     'RTL', 'CIRCLE', 'LAND', 'DRIFT', 'SPORT', 'FLIP', 'AUTOTUNE', 
     'POSHOLD', 'BRAKE', 'THROW', 'AVOID_ADSB', 'GUIDED_NOGPS', 
     'SMART_RTL', 'FLOWHOLD', 'FOLLOW', 'ZIGZAG', 'SYSTEMID', 
     'AUTOROTATE', 'AUTO_RTL'
-]
+})
 
 # Message severity levels
 class MessageSeverity(IntEnum):
@@ -321,4 +322,78 @@ SEVERITY_KEYWORDS = {
     MessageSeverity.ERROR: ['error', 'fail', 'failed', 'timeout'],
     MessageSeverity.WARNING: ['warning', 'warn', 'caution'],
     MessageSeverity.NOTICE: ['notice', 'armed', 'disarmed', 'mode']
-} 
\ No newline at end of file
+}
+
+# Message types grouped by the telemetry channel they are parsed into
+GPS_MESSAGE_TYPES = ('GPS', 'GPS2', 'GPA', 'GPS_RAW_INT', 'GLOBAL_POSITION_INT')
+POSITION_MESSAGE_TYPES = ('POS', 'LOCAL_POSITION_NED', 'CTUN', 'NTUN')
+ALTITUDE_MESSAGE_TYPES = GPS_MESSAGE_TYPES + POSITION_MESSAGE_TYPES
+# Altitude sources, best first. Only rows from the first source present in a log are kept.
+ALTITUDE_SOURCE_PRIORITY = (
+    'POS', 'GLOBAL_POSITION_INT', 'GPS', 'GPS2', 'GPS_RAW_INT', 'LOCAL_POSITION_NED', 'CTUN', 'NTUN'
+)
+BATTERY_MESSAGE_TYPES = ('BAT', 'BATTERY_STATUS', 'CURR', 'POWR')
+RC_MESSAGE_TYPES = ('RCIN', 'RC_CHANNELS', 'RC_CHANNELS_RAW', 'RCOU')
+ATTITUDE_MESSAGE_TYPES = ('ATT', 'ATTITUDE', 'AHR2', 'AHR3')
+EKF_MESSAGE_TYPES = ('XKFS', 'XKQ', 'XKV1', 'XKV2', 'XKT', 'XKFM', 'NKF1', 'NKF2', 'NKF3', 'NKF4', 'NKF5')
+IMU_MESSAGE_TYPES = ('IMU', 'IMU2', 'IMU3', 'ACC', 'ACC2', 'ACC3', 'GYR', 'GYR2', 'GYR3')
+BARO_MESSAGE_TYPES = ('BARO', 'BAR2', 'BAR3')
+MAG_MESSAGE_TYPES = ('MAG', 'MAG2', 'MAG3')
+VIBRATION_MESSAGE_TYPES = ('VIBE', 'VIBRATION')
+TEXT_MESSAGE_TYPES = ('MSG', 'STATUSTEXT', 'ERR')
+
+# Column layouts of the parsed telemetry channels. A 'message_type' column holds
+# the index of the source message in the channel's *_MESSAGE_TYPES tuple.
+ALTITUDE_FIELDS = (
+    'timestamp', 'message_type', 'latitude', 'longitude',
+    'absolute_alt', 'relative_alt'
+)
+GPS_FIELDS = (
+    'timestamp', 'message_type', 'latitude', 'longitude',
+    'absolute_alt', 'relative_alt', 'fix_type', 'satellites',
+    'hdop', 'vdop', 'ground_speed', 'ground_course', 'vertical_speed', 'heading'
+)
+BATTERY_FIELDS = (
+    'timestamp', 'message_type', 'voltage', 'current', 'remaining',
+    'current_total', 'temperature', 'voltage_servo', 'flags',
+    'battery_function', 'battery_type'
+)
+RC_FIELDS = (
+    'timestamp', 'message_type',
+    'chan1', 'chan2', 'chan3', 'chan4', 'chan5', 'chan6', 'chan7', 'chan8', 'rssi',
+    'chan1_out', 'chan2_out', 'chan3_out', 'chan4_out',
+    'chan5_out', 'chan6_out', 'chan7_out', 'chan8_out'
+)
+ATTITUDE_FIELDS = (
+    'timestamp', 'message_type', 'roll', 'pitch', 'yaw',
+    'rollspeed', 'pitchspeed', 'yawspeed', 'altitude', 'latitude', 'longitude'
+)
+HEARTBEAT_FIELDS = (
+    'timestamp', 'type', 'autopilot', 'base_mode', 'custom_mode',
+    'system_status', 'mavlink_version'
+)
+SYSTEM_STATUS_FIELDS = (
+    'timestamp', 'onboard_control_sensors_present', 'onboard_control_sensors_enabled',
+    'onboard_control_sensors_health', 'load', 'voltage_battery', 'current_battery',
+    'battery_remaining', 'drop_rate_comm'
+)
+EKF_FIELDS = (
+    'timestamp', 'message_type', 'roll_innovation', 'pitch_innovation',
+    'yaw_innovation', 'velocity_variance', 'position_variance', 'height_variance',
+    'mag_variance', 'tas_ratio', 'velocity_north', 'velocity_east', 'velocity_down',
+    'q1', 'q2', 'q3', 'q4'
+)
+IMU_FIELDS = (
+    'timestamp', 'message_type', 'gyro_x', 'gyro_y', 'gyro_z',
+    'accel_x', 'accel_y', 'accel_z', 'temperature'
+)
+BARO_FIELDS = ('timestamp', 'message_type', 'pressure', 'altitude', 'temperature', 'climb_rate')
+MAG_FIELDS = (
+    'timestamp', 'message_type', 'mag_x', 'mag_y', 'mag_z', 'mag_field',
+    'offsets_x', 'offsets_y', 'offsets_z'
+)
+PERFORMANCE_FIELDS = ('timestamp', 'loop_time', 'main_loop_count', 'g_dt_max', 'g_dt_min', 'log_dropped')
+VIBRATION_FIELDS = (
+    'timestamp', 'message_type', 'vibe_x', 'vibe_y', 'vibe_z',
+    'clipping_0', 'clipping_1', 'clipping_2'
+)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 
 class ChatMessage(BaseModel):
@@ -18,6 +18,19 @@ class ChatResponse(BaseModel):
     requires_clarification: bool = False
     suggested_questions: Optional[List[str]] = None
 
+class FlightInfo(BaseModel):
+    duration: str = "Unknown"
+    duration_seconds: float = 0
+    messages_count: int = 0
+    start_time: Union[datetime, str] = "Unknown"
+    vehicle_type: str = "Unknown"
+    max_altitude: Union[float, str] = "Unknown"
+    summary_status: str = "pending"  # pending, ready
+
+class UploadResponse(BaseModel):
+    message: str
+    flight_info: FlightInfo
+
 class FlightDataQuery(BaseModel):
     query_type: str  # altitude, gps_loss, battery, flight_time, errors, rc_loss
     parameters: Optional[Dict[str, Any]] = None
@@ -0,0 +1,21 @@
+from .redis_keys import (
+    FLIGHT_NAMESPACE,
+    SUMMARY_NAMESPACE,
+    CHAT_HISTORY_NAMESPACE,
+    CONTENT_NAMESPACE,
+    KEY_DIGEST_BYTES,
+    content_key,
+    make_session_id,
+    redis_key
+)
+
+__all__ = [
+    'FLIGHT_NAMESPACE',
+    'SUMMARY_NAMESPACE',
+    'CHAT_HISTORY_NAMESPACE',
+    'CONTENT_NAMESPACE',
+    'KEY_DIGEST_BYTES',
+    'content_key',
+    'make_session_id',
+    'redis_key'
+]
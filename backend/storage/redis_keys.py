@@ -0,0 +1,33 @@
+"""
+Redis key helpers shared by the API layer and the chatbot agent.
+
+Keys are derived from the "filename:timestamp" session id but hashed to a
+fixed width, so long or non-ASCII filenames never end up verbatim in Redis.
+"""
+
+import blake3
+
+# Key namespaces
+FLIGHT_NAMESPACE = "flight"
+SUMMARY_NAMESPACE = "summary"
+CHAT_HISTORY_NAMESPACE = "chat_history"
+CONTENT_NAMESPACE = "content"
+
+# 16-byte (128-bit) digest, 32 hex chars
+KEY_DIGEST_BYTES = 16
+
+
+def make_session_id(filename: str, timestamp: str) -> str:
+    """Build the session id used by the frontend ("filename:timestamp")"""
+    return f"{filename}:{timestamp}"
+
+
+def redis_key(session_id: str, namespace: str = FLIGHT_NAMESPACE) -> str:
+    """Return the fixed-width Redis key for a session id within a namespace"""
+    digest = blake3.blake3(session_id.encode('utf-8')).hexdigest(length=KEY_DIGEST_BYTES)
+    return f"{namespace}:{digest}"
+
+
+def content_key(content_digest: str) -> str:
+    """Return the key mapping an uploaded file's content digest to its flight data key"""
+    return f"{CONTENT_NAMESPACE}:{content_digest}"